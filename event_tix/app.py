@@ -1,17 +1,22 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request, Query
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.exceptions import RequestValidationError
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, text, asc
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import or_, text, asc, select, update, func, column, bindparam, lambda_stmt, tuple_
 from contextlib import asynccontextmanager
 import os
 from dotenv import load_dotenv
-import traceback
+import logging
+import logging.handlers
+import queue
+import ssl
 from datetime import datetime
 from typing import Optional
 
-from event_tix.db import get_db, init_db, atomic_release_ticket_type
+from event_tix.db import get_async_db, init_db, dispose_engines, atomic_cancel_order
 from event_tix.models import User, Event, TicketType, Order, Ticket, TicketTypeEnum, PromoCode, IdempotencyKey
 from event_tix.schemas import (
     UserRegister, UserCreate, UserResponse, UserLogin, Token,
@@ -22,26 +27,29 @@ from event_tix.schemas import (
     CheckoutRequest, CheckoutResponse, EmailReceiptRequest,
     AdminLogin, AdminToken, EventCreate, EventUpdate,
     TicketTypeCreate, TicketTypeUpdate, PromoCodeCreate, PromoCodeUpdate,
-    EventReport, TicketTypeStats
+    EventReport, TicketTypeStats, from_orm_fast
 )
 from event_tix.auth import (
-    get_password_hash, authenticate_user, create_access_token,
+    get_password_hash, authenticate_user_async, create_access_token,
     get_current_user, ACCESS_TOKEN_EXPIRE_MINUTES,
     authenticate_admin, get_current_admin
 )
-from event_tix.services.queue import enqueue, get_position, get_status
+from event_tix.services.queue import enqueue, get_position, get_status, new_request_id
 from event_tix.services.rate_limit import check_rate_limit
 from event_tix.services.rate_limit_checkout import check_checkout_rate_limit
 from event_tix.services.rate_limit_search import check_search_rate_limit
-import hashlib
-import json
+import orjson
 from event_tix.services.logging import log_email, log_transaction
-from event_tix.services.processing import process_one_manual
-from event_tix.services.promos import validate_promo, redeem_promo
+from event_tix.services.processing import notify_processor
+from event_tix.services.promos import evaluate_promo, redeem_promo, invalidate_promo_cache
+from event_tix.services.external_events import close_http_client
+from event_tix.services.idempotency import get_cached_response, cache_response
+from event_tix.services.lookup_cache import cached, invalidate
+from event_tix.services.response_cache import cache_key, get_cached, set_cached, cached_response, bump_epoch
 from event_tix.routes.organizer import router as organizer_router
 from event_tix.routes.external import router as external_router
 from event_tix.routes.promos import router as promos_router
-from event_tix.util.dates import ensure_utc
+from event_tix.util.dates import ensure_utc, parse_query_date
 from datetime import timedelta
 import asyncio
 
@@ -49,12 +57,31 @@ load_dotenv()
 
 # CORS origins from env
 cors_origins_str = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://127.0.0.1:5173")
-cors_origins = [origin.strip() for origin in cors_origins_str.split(",")]
+cors_origins = {origin.strip() for origin in cors_origins_str.split(",")}  # set: O(1) origin checks
+
+
+# App logging goes through a queue; a listener thread does the formatting
+# (including tracebacks) and the writing, so handlers never block the event loop
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Same-process queue: hand the record over as-is instead of formatting here
+        return record
+
+
+_log_queue = queue.SimpleQueue()
+logger = logging.getLogger("event_tix")
+logger.setLevel(logging.INFO)
+logger.addHandler(_DeferredQueueHandler(_log_queue))
+logger.propagate = False
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+    log_listener.start()
+    # hashlib's SHA-256 comes from this OpenSSL build (SHA-NI accelerated on supporting CPUs)
+    logger.info("hashlib backend: %s", ssl.OPENSSL_VERSION)
     init_db()
     import asyncio
     from event_tix.services.processing import processing_loop, set_processing_enabled
@@ -67,16 +94,27 @@ async def lifespan(app: FastAPI):
         await processing_task
     except asyncio.CancelledError:
         pass
+    await close_http_client()
+    await dispose_engines()
+    log_listener.stop()
 
 
-app = FastAPI(title="Event Ticketing API", lifespan=lifespan)
+app = FastAPI(
+    title="Event Ticketing API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
+# CORS is the only middleware. Starlette's CORSMiddleware is pure ASGI; keep any
+# future middleware that way too (async __call__(scope, receive, send)) rather
+# than subclassing BaseHTTPMiddleware.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type", "Idempotency-Key", "If-None-Match"],
+    max_age=3600,  # let browsers reuse preflight results for an hour
 )
 
 # Include routers
@@ -88,7 +126,7 @@ app.include_router(promos_router)
 # Global exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail}
     )
@@ -96,7 +134,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={"detail": "Validation error", "errors": exc.errors()}
     )
@@ -104,20 +142,63 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
-    # Log the full traceback for debugging
-    print(f"Unhandled exception: {exc}")
-    traceback.print_exc()
-    return JSONResponse(
+    # Log the full traceback for debugging (formatted on the log listener thread)
+    logger.exception("Unhandled exception: %s", exc, exc_info=exc)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Internal server error"}
     )
 
 
+VALID_ROLES = frozenset({"user", "organizer", "admin"})
+
+
+def _like(term: str) -> str:
+    """Substring pattern for ILIKE"""
+    return f"%{term}%"
+
+
+# Hot point lookups as lambda statements: the statement is built and its SQL
+# compiled once, later calls only bind new parameter values
+ORDER_FOR_USER = lambda_stmt(lambda: select(Order).where(
+    Order.id == bindparam("order_id"), Order.user_id == bindparam("user_id")
+))
+ORDER_BY_REQUEST_FOR_USER = lambda_stmt(lambda: select(Order).where(
+    Order.request_id == bindparam("request_id"), Order.user_id == bindparam("user_id")
+))
+EVENT_WITH_TICKET_TYPES = lambda_stmt(lambda: select(Event).options(
+    selectinload(Event.ticket_types)
+).where(Event.id == bindparam("event_id")))
+TICKET_TYPE_BY_ID = lambda_stmt(lambda: select(TicketType).where(TicketType.id == bindparam("ticket_type_id")))
+PROMO_BY_ID = lambda_stmt(lambda: select(PromoCode).where(PromoCode.id == bindparam("promo_id")))
+
+
+# Cached metadata lookups. Events are never hard-deleted, so an event's
+# existence never needs invalidating; ticket-type ids change only on create.
+async def _event_exists(db: AsyncSession, event_id: int) -> bool:
+    async def load():
+        found = (await db.execute(select(Event.id).where(Event.id == event_id))).scalar()
+        return {"id": found} if found else None
+    return await cached(f"event:{event_id}", 300, load) is not None
+
+
+async def _ticket_type_ids(db: AsyncSession, event_id: int) -> dict[str, int]:
+    """Ticket type value ('VIP'/'Regular') -> ticket_types.id for an event"""
+    async def load():
+        rows = (await db.execute(
+            select(TicketType.ticket_type, TicketType.id).where(TicketType.event_id == event_id)
+        )).all()
+        return {tt.value: tt_id for tt, tt_id in rows}
+    return await cached(f"event:{event_id}:ttypes", 300, load)
+
+
 # Auth routes
 @app.post("/api/auth/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if user exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = (await db.execute(
+        select(User).where(User.email == user_data.email)
+    )).scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -125,10 +206,10 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Clamp role to valid values
-    role = user_data.role if user_data.role in ("user", "organizer", "admin") else "user"
+    role = user_data.role if user_data.role in VALID_ROLES else "user"
     
     # Create user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
     user = User(
         name=user_data.name,
         email=user_data.email,
@@ -136,15 +217,15 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         role=role
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     
     return user
 
 
 @app.post("/api/auth/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
-    user = authenticate_user(db, credentials.email, credentials.password)
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user_async(db, credentials.email, credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -166,16 +247,14 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 # Availability route
 @app.get("/api/availability", response_model=AvailabilityResponse)
-def get_availability(event_id: int = 1, db: Session = Depends(get_db)):
-    vip_type = db.query(TicketType).filter(
+async def get_availability(event_id: int = 1, db: AsyncSession = Depends(get_async_db)):
+    rows = (await db.execute(select(TicketType).where(
         TicketType.event_id == event_id,
-        TicketType.ticket_type == TicketTypeEnum.VIP
-    ).first()
-    
-    regular_type = db.query(TicketType).filter(
-        TicketType.event_id == event_id,
-        TicketType.ticket_type == TicketTypeEnum.REGULAR
-    ).first()
+        TicketType.ticket_type.in_([TicketTypeEnum.VIP, TicketTypeEnum.REGULAR])
+    ))).scalars().all()
+    by_type = {row.ticket_type: row for row in rows}
+    vip_type = by_type.get(TicketTypeEnum.VIP)
+    regular_type = by_type.get(TicketTypeEnum.REGULAR)
     
     vip_left = (vip_type.capacity - vip_type.sold_count) if vip_type else 0
     regular_left = (regular_type.capacity - regular_type.sold_count) if regular_type else 0
@@ -185,13 +264,13 @@ def get_availability(event_id: int = 1, db: Session = Depends(get_db)):
 
 # Ticket request route
 @app.post("/api/ticket-requests", response_model=TicketRequestResponse, status_code=status.HTTP_201_CREATED)
-def create_ticket_request(
+async def create_ticket_request(
     request: TicketRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Rate limiting: 1 request per 2 seconds per user
-    is_allowed, rate_limit_message = check_rate_limit(current_user.id)
+    is_allowed, rate_limit_message = await check_rate_limit(current_user.id)
     if not is_allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -206,72 +285,71 @@ def create_ticket_request(
         )
     
     # Verify event exists
-    event = db.query(Event).filter(Event.id == request.event_id).first()
-    if not event:
+    if not await _event_exists(db, request.event_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found"
         )
     
     # Verify ticket type exists for this event
-    ticket_type = db.query(TicketType).filter(
-        TicketType.event_id == request.event_id,
-        TicketType.ticket_type == request.ticket_type
-    ).first()
-    
-    if not ticket_type:
+    if request.ticket_type not in await _ticket_type_ids(db, request.event_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket type not found for this event"
         )
     
-    # Enqueue request
-    request_id, position = enqueue(
-        user_id=current_user.id,
-        event_id=request.event_id,
-        ticket_type=request.ticket_type
-    )
+    ticket_type = TicketTypeEnum(request.ticket_type)
+    request_id = new_request_id()
     
-    # Create order with 'queued' status
+    # Create order with 'queued' status; it is committed before it is
+    # enqueued, so the processor never picks up a request it cannot see
     order = Order(
         user_id=current_user.id,
         event_id=request.event_id,
-        ticket_type=request.ticket_type,
+        ticket_type=ticket_type,
         request_id=request_id,
         status='queued'
     )
     db.add(order)
-    db.commit()
+    await db.commit()
+    
+    # Enqueue request
+    _, position = await enqueue(
+        user_id=current_user.id,
+        event_id=request.event_id,
+        ticket_type=ticket_type,
+        request_id=request_id
+    )
+    notify_processor(request.event_id)
     
     return TicketRequestResponse(
         request_id=request_id,
         position=position,
-        ticket_type=request.ticket_type
+        ticket_type=ticket_type
     )
 
 
 # Queue position route
 @app.get("/api/queue/position", response_model=QueuePositionResponse)
-def get_queue_position(
+async def get_queue_position(
     request_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check if order exists and belongs to user
-    order = db.query(Order).filter(
-        Order.request_id == request_id,
-        Order.user_id == current_user.id
-    ).first()
+    order = (await db.execute(
+        ORDER_BY_REQUEST_FOR_USER, {"request_id": request_id, "user_id": current_user.id}
+    )).scalars().first()
     
     if not order:
         return QueuePositionResponse(status="unknown", position=None)
     
     # Get status from queue tracker
-    queue_status = get_status(request_id)
+    queue_status = await get_status(request_id)
     
     if queue_status == 'queued':
         # Check queue position
-        position_info = get_position(request_id)
+        position_info = await get_position(request_id)
         if position_info:
             position, _ = position_info
             return QueuePositionResponse(status="queued", position=position)
@@ -296,40 +374,46 @@ def get_queue_position(
 
 # Orders route
 @app.get("/api/orders", response_model=list[OrderResponse])
-def get_orders(
+async def get_orders(
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    cursor: Optional[datetime] = Query(None, description="Return orders created before this (last created_at seen)"),
+    cursor_id: Optional[int] = Query(None, description="id of the last order seen; breaks created_at ties"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    orders = db.query(Order).filter(Order.user_id == current_user.id).order_by(Order.created_at.desc()).all()
-    
-    result = []
-    for order in orders:
-        ticket = db.query(Ticket).filter(Ticket.order_id == order.id).first()
-        result.append(OrderResponse(
-            id=order.id,
-            event_id=order.event_id,
-            status=order.status,
-            ticket_type=order.ticket_type,
-            qr_token=ticket.qr_token if ticket else None,
-            ticket_price_cents=order.ticket_price_cents,
-            discount_cents=order.discount_cents,
-            total_cents=order.total_cents,
-            promo_code=order.promo_code,
-            created_at=order.created_at
-        ))
-    
-    return result
+    # Keyset page over (user_id, created_at, id), served by idx_orders_user_created
+    # (SQLite index entries end with the rowid, i.e. orders.id)
+    query = select(Order).where(Order.user_id == current_user.id)
+    if cursor and cursor_id is not None:
+        query = query.where(tuple_(Order.created_at, Order.id) < tuple_(cursor, cursor_id))
+    elif cursor:
+        query = query.where(Order.created_at < cursor)
+    
+    # Load each order's ticket in one batched query instead of one per order
+    orders = (await db.execute(
+        query
+        .options(selectinload(Order.ticket))
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(limit)
+    )).scalars().all()
+    
+    # OrderResponse reads the ORM rows directly (qr_token comes from Order.qr_token)
+    return orders
 
 
 # Ticket verification route
 @app.get("/api/tickets/verify/{qr_token}", response_model=TicketVerifyResponse)
-def verify_ticket(qr_token: str, db: Session = Depends(get_db)):
-    ticket = db.query(Ticket).filter(Ticket.qr_token == qr_token).first()
+async def verify_ticket(qr_token: str, db: AsyncSession = Depends(get_async_db)):
+    ticket = (await db.execute(
+        select(Ticket).where(Ticket.qr_token == qr_token)
+    )).scalars().first()
     
     if not ticket:
         return TicketVerifyResponse(valid=False, status=None, order_id=None, event_id=None, ticket_type=None)
     
-    order = db.query(Order).filter(Order.id == ticket.order_id).first()
+    order = (await db.execute(
+        select(Order).where(Order.id == ticket.order_id)
+    )).scalars().first()
     
     if not order or order.status != 'confirmed':
         return TicketVerifyResponse(
@@ -354,8 +438,10 @@ def verify_ticket(qr_token: str, db: Session = Depends(get_db)):
 
 # Ticket checkin route
 @app.post("/api/tickets/checkin/{qr_token}", response_model=TicketCheckinResponse)
-def checkin_ticket(qr_token: str, db: Session = Depends(get_db)):
-    ticket = db.query(Ticket).filter(Ticket.qr_token == qr_token).first()
+async def checkin_ticket(qr_token: str, db: AsyncSession = Depends(get_async_db)):
+    ticket = (await db.execute(
+        select(Ticket).where(Ticket.qr_token == qr_token)
+    )).scalars().first()
     
     if not ticket:
         return TicketCheckinResponse(
@@ -364,7 +450,9 @@ def checkin_ticket(qr_token: str, db: Session = Depends(get_db)):
             new_status=None
         )
     
-    order = db.query(Order).filter(Order.id == ticket.order_id).first()
+    order = (await db.execute(
+        select(Order).where(Order.id == ticket.order_id)
+    )).scalars().first()
     
     # Check if ticket is valid (order confirmed = "issued" status)
     if not order or order.status != 'confirmed':
@@ -385,7 +473,7 @@ def checkin_ticket(qr_token: str, db: Session = Depends(get_db)):
     # Check in the ticket
     previous_status = "issued"
     ticket.checked_in = True
-    db.commit()
+    await db.commit()
     
     return TicketCheckinResponse(
         ok=True,
@@ -400,7 +488,7 @@ def root():
 
 
 @app.get("/api/health")
-def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """Health check endpoint with DB connection verification"""
     try:
         # Try to get version if available
@@ -413,7 +501,7 @@ def health_check(db: Session = Depends(get_db)):
         # Check DB connection with lightweight query
         db_status = "ok"
         try:
-            db.execute(text("SELECT 1"))
+            await db.execute(text("SELECT 1"))
         except Exception:
             db_status = "error"
         
@@ -432,39 +520,57 @@ def health_check(db: Session = Depends(get_db)):
 
 
 # Events routes
+EVENTS_FTS_MATCH = text("SELECT rowid FROM events_fts WHERE events_fts MATCH :fts_q").columns(column("rowid"))
+
+
 @app.get("/api/events", response_model=list[EventListItem])
-def get_events(db: Session = Depends(get_db)):
+async def get_events(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get list of all published events"""
-    events = db.query(Event).filter(Event.is_published == 1).order_by(Event.starts_at.asc()).all()
-    return events
+    key = cache_key("events:list")
+    hit = get_cached(key)
+    if hit is None:
+        events = (await db.execute(
+            select(Event).where(Event.is_published == 1).order_by(Event.starts_at.asc())
+        )).scalars().all()
+        body = orjson.dumps([from_orm_fast(EventListItem, e).model_dump(mode="json") for e in events])
+        hit = body, set_cached(key, body)
+    return cached_response(request, *hit)
 
 
 @app.get("/api/events/search", response_model=list[EventListItem])
-def search_events(
+async def search_events(
     q: Optional[str] = Query(None, description="Search query (searches name, description, location)"),
     city: Optional[str] = Query(None, description="Filter by city (matches location)"),
     from_date: Optional[str] = Query(None, alias="from", description="Start date (ISO format)"),
     to_date: Optional[str] = Query(None, alias="to", description="End date (ISO format)"),
     category: Optional[str] = Query(None, description="Filter by category"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    cursor: Optional[datetime] = Query(None, description="Return events starting after this (last starts_at seen)"),
+    cursor_id: Optional[int] = Query(None, description="id of the last event seen; breaks starts_at ties"),
     http_request: Request = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search and filter events"""
     # Rate limiting for unauthenticated users
     client_ip = http_request.client.host if http_request and http_request.client else "unknown"
-    is_allowed, rate_limit_message = check_search_rate_limit(client_ip)
+    is_allowed, rate_limit_message = await check_search_rate_limit(client_ip)
     if not is_allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=rate_limit_message
         )
     
-    query = db.query(Event).filter(Event.is_published == 1)
+    query = select(Event).where(Event.is_published == 1)
     
     # Text search across name, description, and location (case-insensitive)
-    if q:
-        search_term = f"%{q}%"
-        query = query.filter(
+    if q and len(q) >= 3:
+        # Trigram index lookup; the quoted phrase keeps MATCH a plain substring search
+        fts_phrase = '"' + q.replace('"', '""') + '"'
+        query = query.where(Event.id.in_(EVENTS_FTS_MATCH.bindparams(fts_q=fts_phrase)))
+    elif q:
+        # Trigrams need at least 3 characters; short terms fall back to a scan
+        search_term = _like(q)
+        query = query.where(
             or_(
                 Event.name.ilike(search_term),
                 Event.description.ilike(search_term),
@@ -474,18 +580,14 @@ def search_events(
     
     # City filter (matches location, case-insensitive)
     if city:
-        city_term = f"%{city}%"
-        query = query.filter(Event.location.ilike(city_term))
+        query = query.where(Event.location.ilike(_like(city)))
     
     # Date range filter
     if from_date:
         try:
             # Handle both YYYY-MM-DD and ISO datetime formats
-            if 'T' in from_date:
-                from_dt = datetime.fromisoformat(from_date.replace('Z', '+00:00'))
-            else:
-                from_dt = datetime.fromisoformat(f"{from_date}T00:00:00")
-            query = query.filter(Event.starts_at >= from_dt)
+            from_dt = parse_query_date(from_date)
+            query = query.where(Event.starts_at >= from_dt)
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -494,13 +596,9 @@ def search_events(
     
     if to_date:
         try:
-            # Handle both YYYY-MM-DD and ISO datetime formats
-            if 'T' in to_date:
-                to_dt = datetime.fromisoformat(to_date.replace('Z', '+00:00'))
-            else:
-                # Set to end of day for date-only inputs
-                to_dt = datetime.fromisoformat(f"{to_date}T23:59:59")
-            query = query.filter(Event.starts_at <= to_dt)
+            # Handle both YYYY-MM-DD and ISO datetime formats (date-only -> end of day)
+            to_dt = parse_query_date(to_date, end_of_day=True)
+            query = query.where(Event.starts_at <= to_dt)
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -509,127 +607,75 @@ def search_events(
     
     # Category filter (case-insensitive)
     if category:
-        query = query.filter(Event.category.ilike(category))
-    
-    events = query.order_by(Event.starts_at.asc()).all()
-    return events
+        query = query.where(Event.category.ilike(category))
+    
+    # Keyset pagination on (starts_at, id); without cursor_id, events sharing
+    # the cursor's starts_at are skipped
+    if cursor and cursor_id is not None:
+        query = query.where(tuple_(Event.starts_at, Event.id) > tuple_(cursor, cursor_id))
+    elif cursor:
+        query = query.where(Event.starts_at > cursor)
+    
+    events = (await db.execute(
+        query.order_by(Event.starts_at.asc(), Event.id.asc()).limit(limit)
+    )).scalars().all()
+    # Rows come straight from the DB: serialize without re-validating each one
+    return Response(
+        content=orjson.dumps([from_orm_fast(EventListItem, e).model_dump(mode="json") for e in events]),
+        media_type="application/json",
+    )
 
 
 @app.get("/api/events/{event_id}", response_model=EventDetail)
-def get_event_detail(event_id: int, db: Session = Depends(get_db)):
+async def get_event_detail(event_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get event details with ticket types (only published events)"""
-    event = db.query(Event).filter(Event.id == event_id, Event.is_published == 1).first()
+    key = cache_key(f"event:{event_id}")
+    hit = get_cached(key)
+    if hit is not None:
+        return cached_response(request, *hit)
+
+    event = (await db.execute(
+        select(Event).options(selectinload(Event.ticket_types))
+        .where(Event.id == event_id, Event.is_published == 1)
+    )).scalars().first()
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found"
         )
     
-    ticket_types = db.query(TicketType).filter(TicketType.event_id == event_id).all()
-    
-    # Ensure UTC datetimes for response
-    starts_at_utc = ensure_utc(event.starts_at) if event.starts_at else None
-    ends_at_utc = ensure_utc(event.ends_at) if event.ends_at else None
-    return EventDetail(
-        id=event.id,
-        name=event.name,
-        description=event.description,
-        image_url=event.image_url,
-        location=event.location,
-        starts_at=starts_at_utc,
-        ends_at=ends_at_utc,
-        category=event.category,
-        tags=event.tags,
-        organizer_id=event.organizer_id,
-        is_published=bool(event.is_published) if event.is_published is not None else True,
-        ticket_types=[
-            TicketTypeInfo(
-                id=tt.id,
-                name=tt.ticket_type.value,  # Convert enum to string
-                capacity=tt.capacity,
-                sold_count=tt.sold_count,
-                price_cents=tt.price_cents
-            )
-            for tt in ticket_types
-        ]
-    )
+    detail = EventDetail.model_validate(event)
+    body = orjson.dumps(detail.model_dump(mode="json"))
+    return cached_response(request, body, set_cached(key, body))
 
 
 
 
 # Helper functions for pricing and promo codes
-def validate_promo_code(
-    promo_code: Optional[str],
-    event_id: int,
-    ticket_type_name: str,
-    db: Session
-) -> tuple[Optional[PromoCode], Optional[str]]:
-    """
-    Validate a promo code and return the promo code object or error message
-    Returns: (promo_code_obj, error_message)
-    """
-    if not promo_code:
-        return None, None
-    
-    promo = db.query(PromoCode).filter(
-        PromoCode.code == promo_code.upper(),
-        PromoCode.event_id == event_id
-    ).first()
-    
-    if not promo:
-        return None, "Promo code not found"
-    
-    # Check expiration
-    if promo.expires_at and promo.expires_at < datetime.utcnow():
-        return None, "Promo code has expired"
-    
-    # Check max uses
-    if promo.max_uses is not None and promo.used_count >= promo.max_uses:
-        return None, "Promo code has reached maximum uses"
-    
-    # Check if applies to this ticket type
-    if promo.applies_to:
-        allowed_types = [t.strip() for t in promo.applies_to.split(',')]
-        if ticket_type_name not in allowed_types:
-            return None, f"Promo code does not apply to {ticket_type_name} tickets"
-    
-    return promo, None
-
+# Ticket type names (upper-cased) -> enum, so lookups skip try/except KeyError
+_TT_BY_NAME = {e.name: e for e in TicketTypeEnum}
 
-def calculate_discount(promo: PromoCode, ticket_price_cents: int) -> int:
-    """Calculate discount amount in cents"""
-    if promo.type == 'percent':
-        if promo.percent is None:
-            return 0
-        discount = int(ticket_price_cents * promo.percent / 100)
-        return min(discount, ticket_price_cents)  # Don't exceed ticket price
-    elif promo.type == 'amount':
-        if promo.value_cents is None:
-            return 0
-        return min(promo.value_cents, ticket_price_cents)  # Don't exceed ticket price
-    return 0
 
-
-def check_user_limit(user_id: int, event_id: int, db: Session, max_per_user: int = 2) -> tuple[bool, int]:
-    """
-    Check if user has reached the per-event ticket limit
-    Returns: (within_limit, current_count)
-    """
-    confirmed_count = db.query(Order).filter(
+def confirmed_order_count(user_id: int, event_id: int):
+    """Scalar subquery counting the user's confirmed orders for an event"""
+    return select(func.count()).select_from(Order).where(
         Order.user_id == user_id,
         Order.event_id == event_id,
         Order.status == 'confirmed'
-    ).count()
-    
-    return confirmed_count < max_per_user, confirmed_count
+    ).scalar_subquery()
 
 
-def validate_sale_window(ticket_type: TicketType) -> tuple[bool, Optional[str]]:
+def check_user_limit(current_count: int, max_per_user: int = 2) -> bool:
+    """Check if user is still under the per-event ticket limit"""
+    return current_count < max_per_user
+
+
+def validate_sale_window(ticket_type: TicketType, now: Optional[datetime] = None) -> tuple[bool, Optional[str]]:
     """
     Check if ticket type is within sale window
     Returns: (is_valid, error_message)
     """
-    now = datetime.utcnow()
+    now = now or datetime.utcnow()
     
     if ticket_type.sale_start and now < ticket_type.sale_start:
         return False, "Ticket sales have not started yet"
@@ -640,29 +686,35 @@ def validate_sale_window(ticket_type: TicketType) -> tuple[bool, Optional[str]]:
     return True, None
 
 
-@app.post("/api/quote", response_model=QuoteResponse)
-def get_quote(
-    request: QuoteRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+async def _price_and_validate(
+    db: AsyncSession,
+    user_id: int,
+    event_id: int,
+    ticket_type_name: str,
+    promo_code: Optional[str],
+) -> tuple[TicketType, int, int, int, Optional[PromoCode]]:
     """
-    Get a price quote for a ticket with optional promo code
-    Validates sale window, capacity, user limit, and promo code
+    Shared quote/checkout validation: ticket type, sale window, capacity,
+    per-user limit and promo code, each checked once.
+    Returns: (ticket_type, ticket_price_cents, discount_cents, total_cents, promo)
     """
-    # Get ticket type
-    try:
-        ticket_type_enum = TicketTypeEnum[request.ticket_type_name.upper()]
-    except KeyError:
+    now = datetime.utcnow()  # one clock read shared by every check below
+    
+    ticket_type_enum = _TT_BY_NAME.get(ticket_type_name.upper())
+    if ticket_type_enum is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid ticket type: {request.ticket_type_name}"
+            detail=f"Invalid ticket type: {ticket_type_name}"
         )
     
-    ticket_type = db.query(TicketType).filter(
-        TicketType.event_id == request.event_id,
-        TicketType.ticket_type == ticket_type_enum
-    ).first()
+    # Ticket type and the user's confirmed-order count in one round trip
+    row = (await db.execute(
+        select(TicketType, confirmed_order_count(user_id, event_id)).where(
+            TicketType.event_id == event_id,
+            TicketType.ticket_type == ticket_type_enum
+        )
+    )).first()
+    ticket_type, current_count = row if row else (None, 0)
     
     if not ticket_type:
         raise HTTPException(
@@ -671,7 +723,7 @@ def get_quote(
         )
     
     # Validate sale window
-    is_valid, error_msg = validate_sale_window(ticket_type)
+    is_valid, error_msg = validate_sale_window(ticket_type, now)
     if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -686,43 +738,63 @@ def get_quote(
         )
     
     # Check user limit (default max_per_user = 2)
-    within_limit, current_count = check_user_limit(
-        current_user.id, request.event_id, db, max_per_user=2
-    )
-    if not within_limit:
+    if not check_user_limit(current_count, max_per_user=2):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"You have reached the maximum ticket limit ({current_count} tickets) for this event"
         )
     
-    # Get base price
     ticket_price_cents = ticket_type.price_cents
+    discount_cents = 0
+    promo = None
     
-    # Validate and apply promo code
-    promo, promo_error = validate_promo_code(
-        request.promo_code, request.event_id, request.ticket_type_name, db
-    )
-    
-    if request.promo_code and promo_error:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=promo_error
+    # Validate and apply promo code if provided
+    if promo_code:
+        ok, msg, discount, new_total, promo = await db.run_sync(
+            lambda sync_db: evaluate_promo(
+                sync_db,
+                code=promo_code,
+                user_id=user_id,
+                event_id=event_id,
+                ticket_type=ticket_type_name,
+                qty=1,  # Single ticket per checkout
+                unit_price_cents=ticket_price_cents,
+                now=now,
+            )
         )
+        if not ok:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=msg
+            )
+        discount_cents = discount
     
-    # Calculate discount
-    discount_cents = 0
-    promo_applied = None
+    total_cents = ticket_price_cents - discount_cents
+    return ticket_type, ticket_price_cents, discount_cents, total_cents, promo
+
+
+@app.post("/api/quote", response_model=QuoteResponse)
+async def get_quote(
+    request: QuoteRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a price quote for a ticket with optional promo code
+    Validates sale window, capacity, user limit, and promo code
+    """
+    _, ticket_price_cents, discount_cents, total_cents, promo = await _price_and_validate(
+        db, current_user.id, request.event_id, request.ticket_type_name, request.promo_code
+    )
     
+    promo_applied = None
     if promo:
-        discount_cents = calculate_discount(promo, ticket_price_cents)
         promo_applied = PromoApplied(
             code=promo.code,
-            type=promo.type,
+            type='percent' if promo.percent_off is not None else 'amount',
             amount=discount_cents
         )
     
-    total_cents = ticket_price_cents - discount_cents
-    
     return QuoteResponse(
         ok=True,
         ticket_price_cents=ticket_price_cents,
@@ -732,126 +804,61 @@ def get_quote(
     )
 
 
+async def _get_idempotent_response(db: AsyncSession, user_id: int, key: str) -> Optional[CheckoutResponse]:
+    """Return the stored checkout response for an Idempotency-Key, if any"""
+    # Redis first: a hit answers the retry with a single GET
+    stored = await get_cached_response(user_id, key)
+    if stored:
+        return CheckoutResponse(**orjson.loads(stored))
+    
+    response_hash = (await db.execute(select(IdempotencyKey.response_hash).where(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key
+    ))).scalar()
+    if not response_hash:
+        return None
+    await cache_response(user_id, key, response_hash.encode())
+    return CheckoutResponse(**orjson.loads(response_hash))
+
+
 @app.post("/api/checkout", response_model=CheckoutResponse)
-def checkout(
+async def checkout(
     request: CheckoutRequest,
     http_request: Request = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Demo checkout - creates order and enqueues for processing
     No real payment gateway, just marks payment_status as 'demo_paid'
     Supports idempotency via Idempotency-Key header
     """
-    # Rate limiting: max 5 requests per minute per user
-    is_allowed, rate_limit_message = check_checkout_rate_limit(current_user.id)
-    if not is_allowed:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=rate_limit_message
-        )
-    
-    # Check idempotency key
+    # Idempotency key: a stored response is authoritative, so a retry is
+    # answered from it before any rate limiting, validation or enqueueing
     idempotency_key = None
     if http_request:
         idempotency_key = http_request.headers.get("Idempotency-Key") or http_request.headers.get("idempotency-key")
     
     if idempotency_key:
-        # Check if we've seen this key before
-        existing_key = db.query(IdempotencyKey).filter(
-            IdempotencyKey.user_id == current_user.id,
-            IdempotencyKey.key == idempotency_key
-        ).first()
-        
-        if existing_key and existing_key.response_hash:
-            # Return cached response
-            # Parse the response hash to reconstruct the response
-            # For simplicity, we'll query the order if it exists
-            # In a real system, you'd store the full response
-            try:
-                response_data = json.loads(existing_key.response_hash)
-                return CheckoutResponse(**response_data)
-            except:
-                # If we can't parse, continue with normal flow
-                pass
-    # Re-validate using quote logic
-    try:
-        ticket_type_enum = TicketTypeEnum[request.ticket_type_name.upper()]
-    except KeyError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid ticket type: {request.ticket_type_name}"
-        )
-    
-    ticket_type = db.query(TicketType).filter(
-        TicketType.event_id == request.event_id,
-        TicketType.ticket_type == ticket_type_enum
-    ).first()
-    
-    if not ticket_type:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket type not found for this event"
-        )
-    
-    # Validate sale window
-    is_valid, error_msg = validate_sale_window(ticket_type)
-    if not is_valid:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=error_msg
-        )
+        stored = await _get_idempotent_response(db, current_user.id, idempotency_key)
+        if stored is not None:
+            return stored
     
-    # Check capacity
-    if ticket_type.sold_count >= ticket_type.capacity:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Tickets are sold out"
-        )
-    
-    # Check user limit
-    within_limit, current_count = check_user_limit(
-        current_user.id, request.event_id, db, max_per_user=2
-    )
-    if not within_limit:
+    # Rate limiting: max 5 requests per minute per user
+    is_allowed, rate_limit_message = await check_checkout_rate_limit(current_user.id)
+    if not is_allowed:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"You have reached the maximum ticket limit ({current_count} tickets) for this event"
-        )
-    
-    # Calculate pricing
-    ticket_price_cents = ticket_type.price_cents
-    discount_cents = 0
-    
-    # Validate and apply promo code if provided
-    if request.promo_code:
-        ok, msg, discount, new_total = validate_promo(
-            db,
-            code=request.promo_code,
-            user_id=current_user.id,
-            event_id=request.event_id,
-            ticket_type=request.ticket_type_name,
-            qty=1,  # Single ticket per checkout
-            unit_price_cents=ticket_price_cents,
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=rate_limit_message
         )
-        if not ok:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=msg
-            )
-        discount_cents = discount
-    
-    total_cents = ticket_price_cents - discount_cents
     
-    # Enqueue request (reuse existing queue system)
-    request_id, position = enqueue(
-        user_id=current_user.id,
-        event_id=request.event_id,
-        ticket_type=ticket_type_enum
+    ticket_type, ticket_price_cents, discount_cents, total_cents, _ = await _price_and_validate(
+        db, current_user.id, request.event_id, request.ticket_type_name, request.promo_code
     )
+    ticket_type_enum = ticket_type.ticket_type
+    request_id = new_request_id()
     
-    # Create order with pricing info
+    # Create order with pricing info (enqueued once committed, below)
     order = Order(
         user_id=current_user.id,
         event_id=request.event_id,
@@ -865,13 +872,15 @@ def checkout(
         payment_status='demo_paid'
     )
     db.add(order)
-    db.commit()
-    db.refresh(order)
+    await db.flush()
     
-    # Redeem promo code after order is successfully created
+    # Redeem promo code in the same transaction as the order
     if request.promo_code:
-        redeem_promo(db, promo_code=request.promo_code, user_id=current_user.id, order_id=order.id)
-        db.commit()
+        await db.run_sync(
+            lambda sync_db: redeem_promo(
+                sync_db, promo_code=request.promo_code, user_id=current_user.id, order_id=order.id
+            )
+        )
     
     response = CheckoutResponse(
         ok=True,
@@ -879,55 +888,73 @@ def checkout(
         message="Order placed successfully. Your ticket will be processed shortly."
     )
     
-    # Store idempotency key if provided
+    # Store the full response with the order so it commits atomically
+    response_body = orjson.dumps(response.model_dump())
     if idempotency_key:
-        response_hash = json.dumps({
-            "ok": response.ok,
-            "order_id": response.order_id,
-            "message": response.message
-        })
-        idempotency_record = IdempotencyKey(
+        db.add(IdempotencyKey(
             user_id=current_user.id,
             key=idempotency_key,
-            response_hash=response_hash
-        )
-        db.add(idempotency_record)
-        db.commit()
+            response_hash=response_body.decode()
+        ))
+    
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request with the same key won the race; return its response
+        await db.rollback()
+        stored = await _get_idempotent_response(db, current_user.id, idempotency_key) if idempotency_key else None
+        if stored is None:
+            raise
+        return stored
+    
+    # Enqueue request (reuse existing queue system) now that the order is visible
+    await enqueue(
+        user_id=current_user.id,
+        event_id=request.event_id,
+        ticket_type=ticket_type_enum,
+        request_id=request_id
+    )
+    notify_processor(request.event_id)
+    
+    if idempotency_key:
+        await cache_response(current_user.id, idempotency_key, response_body)
     
     return response
 
 
 @app.get("/api/promos", response_model=list[PromoCodeResponse])
-def get_promos(
+async def get_promos(
     event_id: int = Query(..., description="Event ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get list of promo codes for an event
     Public endpoint (no auth required for now)
     """
-    promos = db.query(PromoCode).filter(
-        PromoCode.event_id == event_id
-    ).all()
+    async def load():
+        promos = (await db.execute(select(PromoCode).where(
+            PromoCode.event_id == event_id
+        ))).scalars().all()
+        return [{c.name: getattr(p, c.name) for c in PromoCode.__table__.columns} for p in promos]
     
-    return promos
+    return await cached(f"promos:{event_id}", 60, load)
 
 
 @app.post("/api/email/receipt")
-def send_receipt_email(
+async def send_receipt_email(
     request: EmailReceiptRequest,
+    background: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Send receipt email (stub - just logs to emails.log)
     Returns 204 No Content on success
     """
     # Verify order belongs to user
-    order = db.query(Order).filter(
-        Order.id == request.order_id,
-        Order.user_id == current_user.id
-    ).first()
+    order = (await db.execute(
+        ORDER_FOR_USER, {"order_id": request.order_id, "user_id": current_user.id}
+    )).scalars().first()
     
     if not order:
         raise HTTPException(
@@ -935,8 +962,9 @@ def send_receipt_email(
             detail="Order not found"
         )
     
-    # Log email (stub - no actual email sent)
-    log_email(
+    # Log email (stub - no actual email sent) after the response is sent
+    background.add_task(
+        log_email,
         to=current_user.email,
         subject=f"Receipt for Order #{request.order_id}",
         order_id=request.order_id
@@ -946,26 +974,29 @@ def send_receipt_email(
 
 
 @app.post("/api/orders/{order_id}/cancel")
-def cancel_order(
+async def cancel_order(
     order_id: int,
+    background: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Cancel a confirmed order (refund and free up ticket)
     Triggers processor to attempt next queued request
     """
-    # Get order and verify ownership
-    order = db.query(Order).filter(
-        Order.id == order_id,
-        Order.user_id == current_user.id
-    ).first()
-    
-    if not order:
+    # Get order (with its ticket's check-in flag) and verify ownership
+    row = (await db.execute(
+        select(Order, Ticket.checked_in)
+        .outerjoin(Ticket, Ticket.order_id == Order.id)
+        .where(Order.id == order_id, Order.user_id == current_user.id)
+    )).first()
+    
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Order not found"
         )
+    order, checked_in = row
     
     # Check if order can be cancelled
     if order.status != 'confirmed':
@@ -975,75 +1006,51 @@ def cancel_order(
         )
     
     # Check if ticket is already checked in
-    ticket = db.query(Ticket).filter(Ticket.order_id == order.id).first()
-    if ticket and ticket.checked_in:
+    if checked_in:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot cancel order: ticket already checked in"
         )
     
     # Get ticket type to decrement sold_count
-    from event_tix.models import TicketType
-    ticket_type_record = db.query(TicketType).filter(
-        TicketType.ticket_type == order.ticket_type,
-        TicketType.event_id == order.event_id
-    ).first()
+    ticket_type_id = (await _ticket_type_ids(db, order.event_id)).get(order.ticket_type.value)
     
-    if not ticket_type_record:
+    if not ticket_type_id:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Ticket type not found"
         )
     
-    # Atomically decrement sold_count
-    success = atomic_release_ticket_type(db, ticket_type_record.id)
+    # Flip status and decrement sold_count in one transaction; a concurrent
+    # cancel of the same order loses the status guard and releases nothing
+    success = await db.run_sync(atomic_cancel_order, order.id, ticket_type_id)
     if not success:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to release ticket"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order could not be cancelled"
         )
+    bump_epoch()
     
-    # Update order status
-    order.status = 'refunded'
-    db.commit()
-    
-    # Log transaction
-    user = db.query(User).filter(User.id == current_user.id).first()
-    log_transaction({
-        'user_name': user.name if user else 'unknown',
-        'user_email': user.email if user else 'unknown',
+    # Log the transaction after the response is sent and wake the processor
+    # loop so the freed ticket goes to the next queued request (VIP-first)
+    background.add_task(log_transaction, {
+        'user_name': current_user.name,
+        'user_email': current_user.email,
         'ticket_type': order.ticket_type.value,
         'request_id': order.request_id or f'order_{order.id}',
         'status': 'refunded',
         'reason': 'user_cancelled'
     })
-    
-    # Trigger processor to attempt next queued request for this event (VIP-first)
-    # Schedule a single processing tick to immediately process the freed ticket
-    try:
-        import asyncio
-        # Try to get the running event loop
-        try:
-            loop = asyncio.get_running_loop()
-            # Schedule the task in the running loop
-            loop.create_task(process_one_manual())
-        except RuntimeError:
-            # No running loop, create a new one
-            asyncio.run(process_one_manual())
-    except Exception as e:
-        # Log error but don't fail the cancellation
-        from event_tix.services.logging import log_error
-        log_error('cancel_order', f"Failed to trigger processor: {e}")
-        # Processor will pick it up on next tick anyway
+    notify_processor(order.event_id)
     
     return {"ok": True, "message": "Order cancelled successfully"}
 
 
 # Admin routes
 @app.post("/api/admin/login", response_model=AdminToken)
-def admin_login(credentials: AdminLogin):
+async def admin_login(credentials: AdminLogin):
     """Admin login endpoint"""
-    if not authenticate_admin(credentials.email, credentials.password):
+    if not await asyncio.to_thread(authenticate_admin, credentials.email, credentials.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -1064,10 +1071,10 @@ def admin_login(credentials: AdminLogin):
 
 
 @app.post("/api/admin/events", response_model=EventDetail, status_code=status.HTTP_201_CREATED)
-def create_event(
+async def create_event(
     event_data: EventCreate,
     admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new event"""
     event = Event(
@@ -1079,37 +1086,25 @@ def create_event(
         ends_at=ensure_utc(event_data.ends_at) if event_data.ends_at else None,
         category=event_data.category,
         tags=event_data.tags,
-        is_published=1 if event_data.is_published else 0
-    )
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    
-    return EventDetail(
-        id=event.id,
-        name=event.name,
-        description=event.description,
-        image_url=event.image_url,
-        location=event.location,
-        starts_at=event.starts_at,
-        ends_at=event.ends_at,
-        category=event.category,
-        tags=event.tags,
-        organizer_id=event.organizer_id,
-        is_published=bool(event.is_published) if event.is_published is not None else True,
+        is_published=1 if event_data.is_published else 0,
         ticket_types=[]
     )
+    db.add(event)
+    await db.commit()
+    bump_epoch()
+    
+    return EventDetail.model_validate(event)
 
 
 @app.put("/api/admin/events/{event_id}", response_model=EventDetail)
-def update_event(
+async def update_event(
     event_id: int,
     event_data: EventUpdate,
     admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an existing event"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = (await db.execute(EVENT_WITH_TICKET_TYPES, {"event_id": event_id})).scalars().first()
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1134,95 +1129,67 @@ def update_event(
     if event_data.tags is not None:
         event.tags = event_data.tags
     
-    db.commit()
-    db.refresh(event)
-    
-    # Get ticket types
-    ticket_types = db.query(TicketType).filter(TicketType.event_id == event_id).all()
-    
-    return EventDetail(
-        id=event.id,
-        name=event.name,
-        description=event.description,
-        image_url=event.image_url,
-        location=event.location,
-        starts_at=event.starts_at,
-        ends_at=event.ends_at,
-        category=event.category,
-        tags=event.tags,
-        organizer_id=event.organizer_id,
-        is_published=bool(event.is_published) if event.is_published is not None else True,
-        ticket_types=[
-            TicketTypeInfo(
-                id=tt.id,
-                name=tt.ticket_type.value,
-                capacity=tt.capacity,
-                sold_count=tt.sold_count,
-                price_cents=tt.price_cents
-            )
-            for tt in ticket_types
-        ]
-    )
+    await db.commit()
+    bump_epoch()
+    
+    # Ticket types came with the event; the session does not expire on commit
+    return EventDetail.model_validate(event)
 
 
 @app.post("/api/admin/events/{event_id}/ticket-types", response_model=TicketTypeInfo, status_code=status.HTTP_201_CREATED)
-def create_ticket_type(
+async def create_ticket_type(
     event_id: int,
     ticket_type_data: TicketTypeCreate,
     admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a ticket type for an event"""
     # Verify event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
+    if not await _event_exists(db, event_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found"
         )
     
+    ticket_type_enum = TicketTypeEnum(ticket_type_data.ticket_type)
+    
     # Check if ticket type already exists for this event
-    existing = db.query(TicketType).filter(
+    existing = (await db.execute(select(TicketType).where(
         TicketType.event_id == event_id,
-        TicketType.ticket_type == ticket_type_data.ticket_type
-    ).first()
+        TicketType.ticket_type == ticket_type_enum
+    ))).scalars().first()
     
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Ticket type {ticket_type_data.ticket_type.value} already exists for this event"
+            detail=f"Ticket type {ticket_type_data.ticket_type} already exists for this event"
         )
     
     ticket_type = TicketType(
         event_id=event_id,
-        ticket_type=ticket_type_data.ticket_type,
+        ticket_type=ticket_type_enum,
         capacity=ticket_type_data.capacity,
         price_cents=ticket_type_data.price_cents,
         sale_start=ticket_type_data.sale_start,
         sale_end=ticket_type_data.sale_end
     )
     db.add(ticket_type)
-    db.commit()
-    db.refresh(ticket_type)
-    
-    return TicketTypeInfo(
-        id=ticket_type.id,
-        name=ticket_type.ticket_type.value,
-        capacity=ticket_type.capacity,
-        sold_count=ticket_type.sold_count,
-        price_cents=ticket_type.price_cents
-    )
+    await db.commit()
+    bump_epoch()
+    await invalidate(f"event:{event_id}:ttypes")
+    
+    return TicketTypeInfo.model_validate(ticket_type)
 
 
 @app.put("/api/admin/ticket-types/{ticket_type_id}", response_model=TicketTypeInfo)
-def update_ticket_type(
+async def update_ticket_type(
     ticket_type_id: int,
     ticket_type_data: TicketTypeUpdate,
     admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a ticket type"""
-    ticket_type = db.query(TicketType).filter(TicketType.id == ticket_type_id).first()
+    ticket_type = (await db.execute(TICKET_TYPE_BY_ID, {"ticket_type_id": ticket_type_id})).scalars().first()
     if not ticket_type:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1244,41 +1211,28 @@ def update_ticket_type(
     if ticket_type_data.sale_end is not None:
         ticket_type.sale_end = ticket_type_data.sale_end
     
-    db.commit()
-    db.refresh(ticket_type)
+    await db.commit()
+    bump_epoch()
     
-    return TicketTypeInfo(
-        id=ticket_type.id,
-        name=ticket_type.ticket_type.value,
-        capacity=ticket_type.capacity,
-        sold_count=ticket_type.sold_count,
-        price_cents=ticket_type.price_cents
-    )
+    return TicketTypeInfo.model_validate(ticket_type)
 
 
 @app.post("/api/admin/events/{event_id}/promos", response_model=PromoCodeResponse, status_code=status.HTTP_201_CREATED)
-def create_promo(
+async def create_promo(
     event_id: int,
     promo_data: PromoCodeCreate,
     admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a promo code for an event"""
     # Verify event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
+    if not await _event_exists(db, event_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found"
         )
     
-    # Check if promo code already exists
-    existing = db.query(PromoCode).filter(PromoCode.code == promo_data.code.upper()).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Promo code already exists"
-        )
+    code = promo_data.code.upper()
     
     # Validate type and value
     if promo_data.type == 'percent':
@@ -1301,7 +1255,7 @@ def create_promo(
     
     promo = PromoCode(
         event_id=event_id,
-        code=promo_data.code.upper(),
+        code=code,
         type=promo_data.type,
         value_cents=promo_data.value_cents,
         percent=promo_data.percent,
@@ -1310,136 +1264,141 @@ def create_promo(
         applies_to=promo_data.applies_to
     )
     db.add(promo)
-    db.commit()
-    db.refresh(promo)
+    # The unique index on code is the duplicate check (no read-then-insert race)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Promo code already exists"
+        )
+    await invalidate(f"promos:{event_id}")
+    invalidate_promo_cache()
+    await db.refresh(promo)
     
     return promo
 
 
+# PromoCodeUpdate field -> promo_codes column ('code' is normalized separately)
+_PROMO_UPDATE_COLUMNS = {
+    "value_cents": "amount_off_cents",
+    "percent": "percent_off",
+    "max_uses": "max_total_uses",
+    "expires_at": "ends_at",
+    "applies_to": "ticket_type",
+}
+
+
 @app.put("/api/admin/promos/{promo_id}", response_model=PromoCodeResponse)
-def update_promo(
+async def update_promo(
     promo_id: int,
     promo_data: PromoCodeUpdate,
     admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a promo code"""
-    promo = db.query(PromoCode).filter(PromoCode.id == promo_id).first()
-    if not promo:
+    if promo_data.percent is not None and (promo_data.percent < 0 or promo_data.percent > 100):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Promo code not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Percent must be between 0 and 100"
         )
     
-    # Update fields if provided
+    # Update fields if provided, in a single UPDATE ... RETURNING. 'type' has no
+    # column: percent vs amount follows from which discount column is set.
+    changes = {
+        column_name: getattr(promo_data, field)
+        for field, column_name in _PROMO_UPDATE_COLUMNS.items()
+        if getattr(promo_data, field) is not None
+    }
     if promo_data.code is not None:
-        # Check if new code already exists
-        existing = db.query(PromoCode).filter(
-            PromoCode.code == promo_data.code.upper(),
-            PromoCode.id != promo_id
-        ).first()
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Promo code already exists"
-            )
-        promo.code = promo_data.code.upper()
-    
-    if promo_data.type is not None:
-        promo.type = promo_data.type
+        changes["code"] = promo_data.code.upper()
     
-    if promo_data.value_cents is not None:
-        promo.value_cents = promo_data.value_cents
+    stmt = update(PromoCode).where(PromoCode.id == promo_id)
+    if promo_data.max_uses is not None:
+        stmt = stmt.where(PromoCode.used_count <= promo_data.max_uses)
     
-    if promo_data.percent is not None:
-        if promo_data.percent < 0 or promo_data.percent > 100:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Percent must be between 0 and 100"
-            )
-        promo.percent = promo_data.percent
+    try:
+        if changes:
+            promo = (await db.execute(stmt.values(**changes).returning(PromoCode))).scalars().first()
+        else:
+            promo = (await db.execute(PROMO_BY_ID, {"promo_id": promo_id})).scalars().first()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Promo code already exists"
+        )
     
-    if promo_data.max_uses is not None:
-        if promo_data.max_uses < promo.used_count:
+    if not promo:
+        # Nothing matched: either no such promo, or max_uses is below used_count
+        existing = (await db.execute(PROMO_BY_ID, {"promo_id": promo_id})).scalars().first()
+        if not existing:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Max uses cannot be less than used count ({promo.used_count})"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Promo code not found"
             )
-        promo.max_uses = promo_data.max_uses
-    
-    if promo_data.expires_at is not None:
-        promo.expires_at = promo_data.expires_at
-    
-    if promo_data.applies_to is not None:
-        promo.applies_to = promo_data.applies_to
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Max uses cannot be less than used count ({existing.used_count})"
+        )
     
-    db.commit()
-    db.refresh(promo)
+    await invalidate(f"promos:{promo.event_id}")
+    invalidate_promo_cache()
     
     return promo
 
 
 @app.get("/api/admin/promos", response_model=list[PromoCodeResponse])
-def get_admin_promos(
+async def get_admin_promos(
     event_id: Optional[int] = Query(None, description="Filter by event ID"),
     admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get promo codes, optionally filtered by event"""
-    query = db.query(PromoCode)
+    query = select(PromoCode)
     if event_id is not None:
-        query = query.filter(PromoCode.event_id == event_id)
+        query = query.where(PromoCode.event_id == event_id)
     
-    promos = query.all()
+    promos = (await db.execute(query)).scalars().all()
     return promos
 
 
 @app.get("/api/admin/reports", response_model=list[EventReport])
-def get_reports(
+async def get_reports(
     admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get sales reports for all events"""
-    events = db.query(Event).all()
-    reports = []
+    events = (await db.execute(select(Event.id, Event.name))).all()
+    
+    # Capacity/sales per (event_id, ticket_type) in one query
+    type_stats = {}
+    for event_id, ticket_type, capacity, sold_count in (await db.execute(select(
+        TicketType.event_id, TicketType.ticket_type, TicketType.capacity, TicketType.sold_count
+    ))).all():
+        type_stats.setdefault((event_id, ticket_type), (capacity, sold_count))
+    
+    # Confirmed revenue per (event_id, ticket_type), summed in the database
+    revenue = {
+        (event_id, ticket_type): total
+        for event_id, ticket_type, total in (await db.execute(select(
+            Order.event_id, Order.ticket_type, func.coalesce(func.sum(Order.total_cents), 0)
+        ).where(Order.status == 'confirmed').group_by(Order.event_id, Order.ticket_type))).all()
+    }
     
+    reports = []
     for event in events:
-        # Get ticket types
-        vip_type = db.query(TicketType).filter(
-            TicketType.event_id == event.id,
-            TicketType.ticket_type == TicketTypeEnum.VIP
-        ).first()
-        
-        regular_type = db.query(TicketType).filter(
-            TicketType.event_id == event.id,
-            TicketType.ticket_type == TicketTypeEnum.REGULAR
-        ).first()
-        
         # Calculate VIP stats
-        vip_sold = vip_type.sold_count if vip_type else 0
-        vip_capacity = vip_type.capacity if vip_type else 0
+        vip_capacity, vip_sold = type_stats.get((event.id, TicketTypeEnum.VIP), (0, 0))
         vip_remaining = vip_capacity - vip_sold
-        
-        # Calculate VIP revenue from confirmed orders
-        vip_orders = db.query(Order).filter(
-            Order.event_id == event.id,
-            Order.ticket_type == TicketTypeEnum.VIP,
-            Order.status == 'confirmed'
-        ).all()
-        vip_revenue = sum(order.total_cents or 0 for order in vip_orders)
+        vip_revenue = revenue.get((event.id, TicketTypeEnum.VIP), 0)
         
         # Calculate Regular stats
-        regular_sold = regular_type.sold_count if regular_type else 0
-        regular_capacity = regular_type.capacity if regular_type else 0
+        regular_capacity, regular_sold = type_stats.get((event.id, TicketTypeEnum.REGULAR), (0, 0))
         regular_remaining = regular_capacity - regular_sold
-        
-        # Calculate Regular revenue from confirmed orders
-        regular_orders = db.query(Order).filter(
-            Order.event_id == event.id,
-            Order.ticket_type == TicketTypeEnum.REGULAR,
-            Order.status == 'confirmed'
-        ).all()
-        regular_revenue = sum(order.total_cents or 0 for order in regular_orders)
+        regular_revenue = revenue.get((event.id, TicketTypeEnum.REGULAR), 0)
         
         # Calculate totals
         totals_sold = vip_sold + regular_sold
@@ -1,11 +1,18 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
+import hashlib
+import hmac
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status, Security
 from fastapi.security import OAuth2PasswordBearer
-from event_tix.db import get_db
+from event_tix.db import get_async_db
 from event_tix.models import User
 import os
 from dotenv import load_dotenv
@@ -16,9 +23,30 @@ SECRET_KEY = os.getenv("SECRET_KEY", "replace_me_with_random_32_chars")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "43200"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes use argon2id (OWASP minimum parameters); existing bcrypt hashes
+# still verify and are upgraded to argon2id on the user's next login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login", auto_error=False)
 
+# Decoded JWT payloads keyed by token digest: digest -> (expires_at, payload).
+# Entries live at most TOKEN_CACHE_TTL seconds and never past the token's exp.
+_token_cache: "OrderedDict[bytes, tuple[float, dict]]" = OrderedDict()
+TOKEN_CACHE_MAX = 10_000
+TOKEN_CACHE_TTL = 60
+
+# Successful admin logins: HMAC of (email, password, stored hash) -> expires_at.
+# The stored hash is part of the key, so rotating ADMIN_PASSWORD_HASH
+# invalidates every entry.
+_admin_auth_cache: dict[bytes, float] = {}
+ADMIN_AUTH_CACHE_TTL = 300
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -39,10 +67,37 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+def decode_token(token: str) -> dict:
+    """jwt.decode with a small in-process LRU; raises JWTError like jwt.decode"""
+    if not token:
+        raise JWTError("Missing token")
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+    entry = _token_cache.get(key)
+    if entry is not None:
+        if entry[0] > now:
+            _token_cache.move_to_end(key)
+            return entry[1]
+        _token_cache.pop(key, None)
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    expires_at = min(now + TOKEN_CACHE_TTL, payload.get("exp", now))
+    if expires_at > now:
+        _token_cache[key] = (expires_at, payload)
+        if len(_token_cache) > TOKEN_CACHE_MAX:
+            _token_cache.popitem(last=False)
+    return payload
+
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     user = get_user_by_email(db, email)
     if not user:
@@ -52,9 +107,23 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     return user
 
 
+async def authenticate_user_async(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """Async login check; hashing runs in a worker thread so it never blocks the event loop"""
+    user = await get_user_by_email_async(db, email)
+    if not user:
+        return None
+    valid, new_hash = await asyncio.to_thread(pwd_context.verify_and_update, password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    return user
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,13 +131,13 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = get_user_by_email(db, email=email)
+    user = await get_user_by_email_async(db, email=email)
     if user is None:
         raise credentials_exception
     return user
@@ -86,7 +155,17 @@ def authenticate_admin(email: str, password: str) -> bool:
     if email != admin_email:
         return False
     
-    return verify_password(password, admin_password_hash)
+    key = hmac.new(
+        SECRET_KEY.encode(), f"{email}\0{password}\0{admin_password_hash}".encode(), hashlib.sha256
+    ).digest()
+    now = time.time()
+    if _admin_auth_cache.get(key, 0) > now:
+        return True
+    if not verify_password(password, admin_password_hash):
+        return False
+    _admin_auth_cache.clear()
+    _admin_auth_cache[key] = now + ADMIN_AUTH_CACHE_TTL
+    return True
 
 
 async def get_current_admin(
@@ -99,7 +178,7 @@ async def get_current_admin(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         role: str = payload.get("role")
         email: str = payload.get("sub")
         if role != "admin" or email is None:
@@ -111,17 +190,17 @@ async def get_current_admin(
 
 async def get_current_user_optional(
     token: Optional[str] = Security(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Optional[User]:
     """Get current user if authenticated, otherwise return None"""
     if token is None:
         return None
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         email: str = payload.get("sub")
         if email is None:
             return None
-        user = get_user_by_email(db, email=email)
+        user = await get_user_by_email_async(db, email=email)
         return user
     except JWTError:
         return None
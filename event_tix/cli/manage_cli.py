@@ -1,48 +1,56 @@
 import asyncio
 import sys
 from sqlalchemy.orm import Session
-from event_tix.db import SessionLocal
+from event_tix.db import SessionManager
 from event_tix.models import TicketType, TicketTypeEnum, Order
-from event_tix.services.queue import enqueue
+from event_tix.services.queue import enqueue, new_request_id
 from event_tix.services.processing import process_one_manual
 from event_tix.services.logging import get_last_transactions, ensure_csv_header
 
+# One event loop for the whole CLI session: the shared Redis client (when
+# REDIS_URL is set) stays bound to the loop that first used it
+_loop = None
+
+
+def run_async(coro):
+    """Run a coroutine on the CLI's event loop"""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
 
 def view_availability():
     """View current ticket availability"""
-    db = SessionLocal()
     try:
-        vip_type = db.query(TicketType).filter(
-            TicketType.event_id == 1,
-            TicketType.ticket_type == TicketTypeEnum.VIP
-        ).first()
+        with SessionManager() as db:
+            by_type = {tt.ticket_type: tt for tt in db.query(TicketType).filter(
+                TicketType.event_id == 1,
+                TicketType.ticket_type.in_([TicketTypeEnum.VIP, TicketTypeEnum.REGULAR])
+            ).all()}
+            vip_type = by_type.get(TicketTypeEnum.VIP)
+            regular_type = by_type.get(TicketTypeEnum.REGULAR)
         
-        regular_type = db.query(TicketType).filter(
-            TicketType.event_id == 1,
-            TicketType.ticket_type == TicketTypeEnum.REGULAR
-        ).first()
-        
-        print("\n" + "=" * 50)
-        print("Ticket Availability")
-        print("=" * 50)
+            print("\n" + "=" * 50)
+            print("Ticket Availability")
+            print("=" * 50)
         
-        if vip_type:
-            vip_left = vip_type.capacity - vip_type.sold_count
-            print(f"VIP: {vip_left}/{vip_type.capacity} available")
-        else:
-            print("VIP: Not found")
+            if vip_type:
+                vip_left = vip_type.capacity - vip_type.sold_count
+                print(f"VIP: {vip_left}/{vip_type.capacity} available")
+            else:
+                print("VIP: Not found")
         
-        if regular_type:
-            regular_left = regular_type.capacity - regular_type.sold_count
-            print(f"Regular: {regular_left}/{regular_type.capacity} available")
-        else:
-            print("Regular: Not found")
+            if regular_type:
+                regular_left = regular_type.capacity - regular_type.sold_count
+                print(f"Regular: {regular_left}/{regular_type.capacity} available")
+            else:
+                print("Regular: Not found")
         
-        print("=" * 50 + "\n")
+            print("=" * 50 + "\n")
     except Exception as e:
         print(f"\nError viewing availability: {e}\n")
-    finally:
-        db.close()
 
 
 def enqueue_test_request():
@@ -66,25 +74,27 @@ def enqueue_test_request():
         user_id = 1
         event_id = 1
         
-        # Enqueue request
-        request_id, position = enqueue(
-            user_id=user_id,
-            event_id=event_id,
-            ticket_type=ticket_type
-        )
+        request_id = new_request_id()
         
-        # Create order with 'queued' status
-        db = SessionLocal()
+        # Create order with 'queued' status, then enqueue it once committed
         try:
-            order = Order(
+            with SessionManager() as db:
+                order = Order(
+                    user_id=user_id,
+                    event_id=event_id,
+                    ticket_type=ticket_type,
+                    request_id=request_id,
+                    status='queued'
+                )
+                db.add(order)
+                db.commit()
+            
+            _, position = run_async(enqueue(
                 user_id=user_id,
                 event_id=event_id,
                 ticket_type=ticket_type,
-                request_id=request_id,
-                status='queued'
-            )
-            db.add(order)
-            db.commit()
+                request_id=request_id
+            ))
             
             print("\n" + "=" * 50)
             print("✓ Request Enqueued")
@@ -94,10 +104,7 @@ def enqueue_test_request():
             print(f"Type: {ticket_type.value}")
             print("=" * 50 + "\n")
         except Exception as e:
-            db.rollback()
             print(f"\nError creating order: {e}\n")
-        finally:
-            db.close()
             
     except KeyboardInterrupt:
         print("\n\nCancelled.\n")
@@ -109,11 +116,7 @@ def process_next_tick():
     """Process one tick manually"""
     print("\nProcessing next tick...")
     try:
-        # Create a new event loop for this call
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(process_one_manual())
-        loop.close()
+        run_async(process_one_manual())
         print("✓ Tick processed\n")
     except Exception as e:
         print(f"\nError processing tick: {e}\n")
@@ -2,23 +2,16 @@
 from event_tix.db import engine
 from sqlalchemy import text
 
-def col_exists(table, name):
-    with engine.connect() as conn:
-        rows = conn.exec_driver_sql(f"PRAGMA table_info({table});").fetchall()
-        cols = {r[1] for r in rows}
-        return name in cols
-
-def table_exists(name):
-    with engine.connect() as conn:
-        rows = conn.exec_driver_sql(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=:n;", {"n": name}
-        ).fetchall()
-        return bool(rows)
+def existing_tables(conn):
+    """All table names, from one sqlite_master read on the migration's connection"""
+    rows = conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
+    return {r[0] for r in rows}
 
 def ensure_schema():
     with engine.begin() as conn:
+        tables = existing_tables(conn)
         # promo_codes
-        if not table_exists("promo_codes"):
+        if "promo_codes" not in tables:
             conn.exec_driver_sql("""
                 CREATE TABLE promo_codes (
                     id INTEGER PRIMARY KEY,
@@ -40,7 +33,7 @@ def ensure_schema():
                 );
             """)
         # promo_redemptions
-        if not table_exists("promo_redemptions"):
+        if "promo_redemptions" not in tables:
             conn.exec_driver_sql("""
                 CREATE TABLE promo_redemptions (
                     id INTEGER PRIMARY KEY,
@@ -50,6 +43,13 @@ def ensure_schema():
                     used_at DATETIME
                 );
             """)
+        # promo lookups compare upper(code) so legacy mixed-case rows still match;
+        # the expression index turns that into a B-tree probe instead of a scan
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_promo_codes_code_upper ON promo_codes(upper(code))")
+        # validate_promo counts redemptions by (promo_id, user_id) on every checkout;
+        # the composite also serves promo_id-only lookups through its leading column
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_prom_red_promo_user ON promo_redemptions(promo_id, user_id)")
+        conn.exec_driver_sql("ANALYZE promo_redemptions")
 
 if __name__ == "__main__":
     ensure_schema()
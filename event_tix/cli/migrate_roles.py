@@ -2,29 +2,46 @@
 from sqlalchemy import text
 from event_tix.db import engine
 
-def column_exists(table, col):
-    with engine.connect() as conn:
-        rows = conn.exec_driver_sql(f"PRAGMA table_info({table});").fetchall()
-        return any(r[1] == col for r in rows)
+def table_columns(conn, table):
+    """Column names of a table, from one PRAGMA on the migration's connection"""
+    return {r[1] for r in conn.exec_driver_sql(f"PRAGMA table_info({table});").fetchall()}
 
 def ensure_columns():
     with engine.begin() as conn:
+        users_cols = table_columns(conn, "users")
+        events_cols = table_columns(conn, "events")
+        tt_cols = table_columns(conn, "ticket_types")
         # users.role
-        if not column_exists("users", "role"):
+        if "role" not in users_cols:
             conn.exec_driver_sql("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'user'")
         # events.organizer_id + events.is_published
-        if not column_exists("events", "organizer_id"):
+        if "organizer_id" not in events_cols:
             conn.exec_driver_sql("ALTER TABLE events ADD COLUMN organizer_id INTEGER")
-        if not column_exists("events", "is_published"):
+        if "is_published" not in events_cols:
             conn.exec_driver_sql("ALTER TABLE events ADD COLUMN is_published INTEGER DEFAULT 1")
         # ticket_types.sale_start / sale_end (prevents earlier errors)
-        if not column_exists("ticket_types", "sale_start"):
+        if "sale_start" not in tt_cols:
             conn.exec_driver_sql("ALTER TABLE ticket_types ADD COLUMN sale_start DATETIME")
-        if not column_exists("ticket_types", "sale_end"):
+        if "sale_end" not in tt_cols:
             conn.exec_driver_sql("ALTER TABLE ticket_types ADD COLUMN sale_end DATETIME")
         # helpful indexes
         conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_users_role ON users(role)")
         conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_events_organizer_id ON events(organizer_id)")
+        # composite indexes for hot listing / lookup queries
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_events_pub_starts ON events(is_published, starts_at)")
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_orders_user_created ON orders(user_id, created_at)")
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_orders_user_event_status ON orders(user_id, event_id, status)")
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_orders_event_status_type ON orders(event_id, status, ticket_type, total_cents)")
+        # refresh planner stats so the new composite indexes are picked up
+        conn.exec_driver_sql("ANALYZE events")
+        conn.exec_driver_sql("ANALYZE orders")
+        # one idempotency row per (user, key): drop duplicates, then enforce it
+        conn.exec_driver_sql("DROP INDEX IF EXISTS idx_idempotency_user_key")
+        conn.exec_driver_sql(
+            "DELETE FROM idempotency_keys WHERE id NOT IN "
+            "(SELECT MIN(id) FROM idempotency_keys GROUP BY user_id, key)"
+        )
+        conn.exec_driver_sql("CREATE UNIQUE INDEX IF NOT EXISTS uq_idempotency_user_key ON idempotency_keys(user_id, key)")
 
 if __name__ == "__main__":
     ensure_columns()
@@ -0,0 +1,6 @@
+# event_tix/cli/migrate_search.py
+from event_tix.db import ensure_search_index
+
+if __name__ == "__main__":
+    ensure_search_index(rebuild=True)
+    print("Event search index migration complete.")
@@ -1,17 +1,101 @@
-from sqlalchemy import create_engine, text
+from typing import Optional
+from sqlalchemy import Row, create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from event_tix.models import Base
 import os
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./event_tix.db"
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./event_tix.db"
+
+# Connection pool sizing, per process and per engine. SQLite serializes writers
+# anyway and every connection carries its own page cache (see SQLITE_PRAGMAS),
+# so keep the pool small and warm rather than wide. A file database has no
+# server to drop idle connections, so there is no pre-ping or recycling.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Compiled-statement cache entries per engine (SQLAlchemy default is 500)
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    # Hand out the most recently returned connection so the processor and
+    # CLI keep hitting the same warm connection (and its page cache)
+    pool_use_lifo=True,
+    query_cache_size=DB_QUERY_CACHE_SIZE,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for request handlers so DB I/O yields to the event loop
+# instead of tying up a threadpool worker per request.
+# aiosqlite defaults to NullPool (a new connection + thread per checkout);
+# pool connections instead so requests reuse them.
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    query_cache_size=DB_QUERY_CACHE_SIZE,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Per-connection SQLite tuning. WAL lets readers proceed while a writer holds
+# the lock (ticket reservations no longer block listings); NORMAL sync is
+# durable across app crashes in WAL mode; busy_timeout waits for the write lock
+# instead of failing with "database is locked".
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+]
+
+
+def _apply_sqlite_pragmas(dbapi_conn, _record):
+    cursor = dbapi_conn.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _optimize_on_close(dbapi_conn, _record):
+    """Let SQLite refresh planner statistics (usually a no-op) before a pooled
+    connection is really closed: when an overflow connection is returned to a
+    full pool, when an errored connection is invalidated, or on dispose"""
+    try:
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA optimize")
+        cursor.close()
+    except Exception:
+        pass
+
+
+# WAL needs a real file; in-memory databases keep their defaults
+if ":memory:" not in SQLALCHEMY_DATABASE_URL:
+    for _engine in (engine, async_engine.sync_engine):
+        event.listen(_engine, "connect", _apply_sqlite_pragmas)
+        event.listen(_engine, "close", _optimize_on_close)
+
+
+async def dispose_engines():
+    """Close pooled connections on shutdown (runs PRAGMA optimize on each)"""
+    engine.dispose()
+    await async_engine.dispose()
+
 
 def get_db():
     db = SessionLocal()
@@ -21,47 +105,197 @@ def get_db():
         db.close()
 
 
+class SessionManager:
+    """
+    Session scope for code outside request handlers (CLI, scripts):
+    rolls back on error and always returns the connection to the pool.
+    """
+
+    def __enter__(self) -> Session:
+        self.db = SessionLocal()
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.db.rollback()
+        self.db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# FTS5 trigram index over the searchable event columns (SQLite's analogue of
+# pg_trgm): MATCH on a quoted phrase is a case-insensitive substring match,
+# same as ILIKE '%q%', but served from the index. Triggers keep it in sync.
+EVENTS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        name, description, location,
+        content='events', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, name, description, location)
+        VALUES (new.id, new.name, new.description, new.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, name, description, location)
+        VALUES ('delete', old.id, old.name, old.description, old.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, name, description, location)
+        VALUES ('delete', old.id, old.name, old.description, old.location);
+        INSERT INTO events_fts(rowid, name, description, location)
+        VALUES (new.id, new.name, new.description, new.location);
+    END
+    """,
+]
+
+
+def ensure_search_index(rebuild: bool = False):
+    """Create the events FTS index and triggers; backfill it when first created"""
+    with engine.begin() as conn:
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_fts'"
+        ).first() is not None
+        for ddl in EVENTS_FTS_DDL:
+            conn.exec_driver_sql(ddl)
+        if rebuild or not exists:
+            conn.exec_driver_sql("INSERT INTO events_fts(events_fts) VALUES ('rebuild')")
+
+
+# PRAGMA schema_version seen after the last successful init_db in this process
+_inited_schema_version: Optional[int] = None
+
+
+def _schema_version() -> int:
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA schema_version").scalar()
+
+
 def init_db():
+    """Sync tables and the search index; a no-op while the schema is unchanged"""
+    global _inited_schema_version
+    if _inited_schema_version is not None and _schema_version() == _inited_schema_version:
+        return
     Base.metadata.create_all(bind=engine)
+    ensure_search_index()
+    # Read after our own DDL, which bumps the version itself
+    _inited_schema_version = _schema_version()
 
 
-def atomic_reserve_ticket_type(db: Session, ticket_type_id: int) -> bool:
+def atomic_reserve_ticket_type(db: Session, ticket_type_id: int) -> Optional[Row]:
     """
     Atomically reserve a ticket by incrementing sold_count if capacity allows.
-    Returns True if reservation succeeded, False otherwise.
+    Returns the post-update (sold_count, capacity, price_cents) row if the
+    reservation succeeded, None otherwise.
     """
     try:
-        result = db.execute(
+        row = db.execute(
             text("""
             UPDATE ticket_types 
             SET sold_count = sold_count + 1 
             WHERE id = :ticket_type_id AND sold_count < capacity
+            RETURNING sold_count, capacity, price_cents
             """),
             {"ticket_type_id": ticket_type_id}
-        )
+        ).first()
         db.commit()
-        return result.rowcount == 1
+        return row
     except SQLAlchemyError:
         db.rollback()
-        return False
+        return None
+
+
+def atomic_reserve_ticket_types(db: Session, ticket_type_id: int, count: int) -> int:
+    """
+    Reserve up to `count` tickets of one type with guarded increments.
+    Returns how many were reserved (0 when sold out or missing). Does not
+    commit: the caller commits together with the orders it confirms.
+    """
+    while count > 0:
+        reserved = db.execute(
+            text("""
+            UPDATE ticket_types
+            SET sold_count = sold_count + :count
+            WHERE id = :ticket_type_id AND sold_count + :count <= capacity
+            """),
+            {"ticket_type_id": ticket_type_id, "count": count}
+        )
+        if reserved.rowcount == 1:
+            return count
+        # Not enough seats for the whole group: take what is left
+        available = db.execute(
+            text("SELECT capacity - sold_count FROM ticket_types WHERE id = :ticket_type_id"),
+            {"ticket_type_id": ticket_type_id}
+        ).scalar()
+        if not available or available <= 0:
+            return 0
+        count = min(count, available)
+    return 0
 
 
-def atomic_release_ticket_type(db: Session, ticket_type_id: int) -> bool:
+def atomic_release_ticket_type(db: Session, ticket_type_id: int) -> Optional[Row]:
     """
     Atomically release a ticket by decrementing sold_count (guard >= 0).
-    Returns True if release succeeded, False otherwise.
+    Returns the post-update (sold_count, capacity, price_cents) row if the
+    release succeeded, None otherwise.
     """
     try:
-        result = db.execute(
+        row = db.execute(
             text("""
             UPDATE ticket_types 
             SET sold_count = sold_count - 1 
             WHERE id = :ticket_type_id AND sold_count > 0
+            RETURNING sold_count, capacity, price_cents
+            """),
+            {"ticket_type_id": ticket_type_id}
+        ).first()
+        db.commit()
+        return row
+    except SQLAlchemyError:
+        db.rollback()
+        return None
+
+
+def atomic_cancel_order(db: Session, order_id: int, ticket_type_id: int) -> bool:
+    """
+    Flip a confirmed order to 'refunded' and release its ticket in one transaction.
+    The status guard makes concurrent cancels of the same order release only once.
+    Returns True if both updates applied, False otherwise (nothing is changed).
+    """
+    try:
+        flipped = db.execute(
+            text("""
+            UPDATE orders
+            SET status = 'refunded'
+            WHERE id = :order_id AND status = 'confirmed'
+            """),
+            {"order_id": order_id}
+        )
+        if flipped.rowcount != 1:
+            db.rollback()
+            return False
+        released = db.execute(
+            text("""
+            UPDATE ticket_types
+            SET sold_count = sold_count - 1
+            WHERE id = :ticket_type_id AND sold_count > 0
             """),
             {"ticket_type_id": ticket_type_id}
         )
+        if released.rowcount != 1:
+            db.rollback()
+            return False
         db.commit()
-        return result.rowcount == 1
+        return True
     except SQLAlchemyError:
         db.rollback()
         return False
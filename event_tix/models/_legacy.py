@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -25,6 +25,10 @@ class User(Base):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Published listings filter on is_published and order by starts_at
+        Index("idx_events_pub_starts", "is_published", "starts_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -39,7 +43,9 @@ class Event(Base):
     is_published = Column(Integer, default=1, nullable=False)  # 1=true in SQLite
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    ticket_types = relationship("TicketType", back_populates="event", cascade="all, delete-orphan")
+    # lazy="raise": load explicitly with selectinload(Event.ticket_types) so no
+    # handler issues a hidden per-event query
+    ticket_types = relationship("TicketType", back_populates="event", cascade="all, delete-orphan", lazy="raise")
 
 
 class TicketType(Base):
@@ -60,6 +66,11 @@ class TicketType(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("idx_orders_user_created", "user_id", "created_at"),
+        Index("idx_orders_user_event_status", "user_id", "event_id", "status"),
+        Index("idx_orders_event_status_type", "event_id", "status", "ticket_type", "total_cents"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -79,6 +90,11 @@ class Order(Base):
     event = relationship("Event")
     ticket = relationship("Ticket", back_populates="order", uselist=False, cascade="all, delete-orphan")
 
+    @property
+    def qr_token(self):
+        """QR token of the issued ticket, if any"""
+        return self.ticket.qr_token if self.ticket else None
+
 
 class Ticket(Base):
     __tablename__ = "tickets"
@@ -94,6 +110,9 @@ class Ticket(Base):
 
 class IdempotencyKey(Base):
     __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("uq_idempotency_user_key", "user_id", "key", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,12 +1,11 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from event_tix.models import Base
 
 class PromoCode(Base):
     __tablename__ = "promo_codes"
-    __table_args__ = {"extend_existing": True}
-    
+
     id = Column(Integer, primary_key=True, index=True)
     code = Column(String(64), unique=True, index=True, nullable=False)  # case-insensitive compare in code
     organizer_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -29,13 +28,17 @@ class PromoCode(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow)
 
+# Lookups compare upper(code) so legacy mixed-case rows still match; index the expression
+Index("ix_promo_codes_code_upper", func.upper(PromoCode.code))
+
 class PromoRedemption(Base):
     __tablename__ = "promo_redemptions"
-    __table_args__ = {"extend_existing": True}
-    
+
     id = Column(Integer, primary_key=True, index=True)
     promo_id = Column(Integer, ForeignKey("promo_codes.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
     used_at = Column(DateTime, default=datetime.utcnow)
 
+
+Index("idx_prom_red_promo_user", PromoRedemption.promo_id, PromoRedemption.user_id)
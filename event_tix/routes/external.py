@@ -1,22 +1,23 @@
 # event_tix/routes/external.py
+import asyncio
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import asc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import asc, select
 from typing import Optional
 
-from event_tix.db import get_db
+from event_tix.db import get_async_db
 from event_tix.models import Event
 from event_tix.services.external_events import search_external_events
-from event_tix.util.dates import ensure_utc
+from event_tix.util.dates import to_utc_iso
 
 router = APIRouter()
 
-def map_local_event(e: Event) -> dict:
-    # Ensure UTC datetime for starts_at
-    starts_at_iso = None
-    if e.starts_at:
-        utc_dt = ensure_utc(e.starts_at)
-        starts_at_iso = utc_dt.isoformat().replace("+00:00", "Z") if utc_dt else None
+# Only the columns map_local_event reads; rows skip ORM instance construction
+LOCAL_EVENT_COLUMNS = [Event.id, Event.name, Event.image_url, Event.location, Event.starts_at, Event.category]
+
+
+def map_local_event(e) -> dict:
+    """Map a local event (Event or LOCAL_EVENT_COLUMNS row) to the external feed shape"""
     return {
         "source": "local",
         "external_id": None,
@@ -24,36 +25,37 @@ def map_local_event(e: Event) -> dict:
         "name": e.name,
         "image_url": e.image_url,
         "location": e.location,
-        "starts_at": starts_at_iso,
+        "starts_at": to_utc_iso(e.starts_at),  # cached: event times recur across requests
         "url": None,
         "category": e.category or "General",
     }
 
 @router.get("/api/external/events")
-def get_external_events(
+async def get_external_events(
     city: Optional[str] = Query(default=None),
     q: Optional[str] = Query(default=None),
     size: int = Query(default=24, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    # 1) Try external providers (may return [])
-    try:
-        external = search_external_events(city=city, keyword=q, size=size) or []
-    except Exception:
-        external = []
+    # The provider call and the local query are independent, so run them
+    # side by side: latency is max(external, local) instead of the sum.
+    # Locals are fetched up to `size` up front and trimmed after the merge.
+    # Served by idx_events_pub_starts: one range scan covers filter + ORDER BY.
+    # search_external_events never raises (provider failures come back as []),
+    # so only a local query error or a cancellation propagates.
+    external, locals_q = await asyncio.gather(
+        search_external_events(city=city, keyword=q, size=size),
+        db.execute(
+            select(*LOCAL_EVENT_COLUMNS)
+            .where(Event.is_published == 1)
+            .order_by(asc(Event.starts_at))
+            .limit(size)
+        ),
+    )
 
-    # 2) Always include locals to fill up to `size`
+    # 1) Always include locals to fill up to `size`
     remaining = max(size - len(external), 0)
-    local_limit = size if len(external) == 0 else remaining
-
-    locals_q = (
-        db.query(Event)
-        .filter(Event.is_published == 1)
-        .order_by(asc(Event.starts_at))
-        .limit(local_limit)
-        .all()
-    )
-    local_mapped = [map_local_event(e) for e in locals_q]
+    local_mapped = [map_local_event(e) for e in locals_q.all()[:remaining]]
 
-    # 3) Merge (external first, then locals), cap to size
+    # 2) Merge (external first, then locals), cap to size
     return (external + local_mapped)[:size]
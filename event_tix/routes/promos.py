@@ -1,10 +1,13 @@
+import anyio
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
 from event_tix.db import get_db
 from event_tix.auth import get_current_user_optional, get_current_user
-from event_tix.services.promos import validate_promo, normalize
+from event_tix.services.promos import validate_promo, normalize, invalidate_promo_cache
+from event_tix.services.lookup_cache import invalidate
 from event_tix.models.promo import PromoCode
 from datetime import datetime
 
@@ -50,16 +53,13 @@ def create_promo(payload: PromoCreate, db: Session = Depends(get_db), user=Depen
     # must be organizer/admin
     if user.role not in ("organizer", "admin"):
         raise HTTPException(status_code=403, detail="Organizer only")
-    # unique code (case-insensitive)
-    codeN = normalize(payload.code)
-    existing = db.query(PromoCode).filter(func.upper(PromoCode.code) == codeN).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Code already exists")
-
     if (payload.percent_off is None) == (payload.amount_off_cents is None):
         raise HTTPException(status_code=400, detail="Provide either percent_off OR amount_off_cents")
 
-    promo = PromoCode(
+    # unique code (case-insensitive): codes are stored normalized and the unique
+    # index rejects duplicates, so one INSERT replaces the read-then-insert
+    codeN = normalize(payload.code)
+    stmt = insert(PromoCode).values(
         code=codeN,  # Store normalized (uppercase) code
         organizer_id=user.id,
         event_id=payload.event_id,
@@ -72,30 +72,34 @@ def create_promo(payload: PromoCreate, db: Session = Depends(get_db), user=Depen
         starts_at=payload.starts_at,
         ends_at=payload.ends_at,
         is_active=payload.is_active,
-    )
-    db.add(promo)
+    ).on_conflict_do_nothing(index_elements=["code"]).returning(PromoCode.id)
+    promo_id = db.execute(stmt).scalar()
+    if promo_id is None:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Code already exists")
     db.commit()
-    db.refresh(promo)
-    return {"id": promo.id, "code": promo.code}
+    invalidate_promo_cache()  # a cached "invalid code" miss must not outlive the insert
+    if payload.event_id:
+        # Sync route (threadpool): run the async invalidation on the event loop
+        # and wait for it, so the new promo is listed as soon as we return
+        anyio.from_thread.run(invalidate, f"promos:{payload.event_id}")
+    return {"id": promo_id, "code": codeN}
+
+PROMO_LIST_COLUMNS = [
+    PromoCode.id, PromoCode.code, PromoCode.event_id, PromoCode.ticket_type,
+    PromoCode.percent_off, PromoCode.amount_off_cents, PromoCode.used_count,
+    PromoCode.max_total_uses, PromoCode.is_active, PromoCode.starts_at, PromoCode.ends_at,
+]
 
 @router.get("/organizer/promos")
 def list_promos(db: Session = Depends(get_db), user=Depends(get_current_user)):
     if user.role not in ("organizer", "admin"):
         raise HTTPException(status_code=403, detail="Organizer only")
-    promos = db.query(PromoCode).filter(PromoCode.organizer_id == user.id).order_by(PromoCode.created_at.desc()).all()
-    return [
-        {
-            "id": p.id,
-            "code": p.code,
-            "event_id": p.event_id,
-            "ticket_type": p.ticket_type,
-            "percent_off": p.percent_off,
-            "amount_off_cents": p.amount_off_cents,
-            "used_count": p.used_count,
-            "max_total_uses": p.max_total_uses,
-            "is_active": p.is_active,
-            "starts_at": p.starts_at,
-            "ends_at": p.ends_at,
-        } for p in promos
-    ]
+    # Plain column rows straight into dicts: no ORM hydration per promo
+    rows = db.execute(
+        select(*PROMO_LIST_COLUMNS)
+        .where(PromoCode.organizer_id == user.id)
+        .order_by(PromoCode.created_at.desc())
+    ).mappings().all()
+    return [dict(row) for row in rows]
 
@@ -1,7 +1,22 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import AliasChoices, BaseModel, ConfigDict, EmailStr, Field, field_validator
+from typing import ClassVar, Literal, Optional
 from datetime import datetime
 from event_tix.models import TicketTypeEnum
+from event_tix.util.dates import ensure_utc
+
+# TicketTypeEnum values as a Literal for request bodies: pydantic-core checks a
+# Literal with one hash lookup. Handlers convert with TicketTypeEnum(value).
+TicketTypeName = Literal["VIP", "Regular"]
+
+class FastORM(BaseModel):
+    """Base for listing schemas built per DB row; caches the field names at class creation"""
+    __field_names__: ClassVar[tuple[str, ...]] = ()
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        # model_fields is only complete once pydantic has built the class
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.__field_names__ = tuple(cls.model_fields)
 
 
 # Auth schemas
@@ -24,8 +39,7 @@ class UserResponse(BaseModel):
     email: str
     role: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserLogin(BaseModel):
@@ -40,7 +54,7 @@ class Token(BaseModel):
 
 
 # Event schemas
-class EventListItem(BaseModel):
+class EventListItem(FastORM):
     id: int
     name: str
     image_url: Optional[str] = None
@@ -49,19 +63,19 @@ class EventListItem(BaseModel):
     ends_at: Optional[datetime] = None
     category: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TicketTypeInfo(BaseModel):
     id: int
-    name: str  # ticket_type enum value as string
+    # ticket_type enum value as string; read from TicketType.ticket_type when
+    # validating an ORM row
+    name: str = Field(validation_alias=AliasChoices("name", "ticket_type"))
     capacity: int
     sold_count: int
     price_cents: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class EventOut(BaseModel):
@@ -75,28 +89,19 @@ class EventOut(BaseModel):
     category: Optional[str] = None
     tags: Optional[str] = None
     organizer_id: Optional[int] = None
-    is_published: bool = True
+    is_published: bool = True  # stored as 0/1
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("starts_at", "ends_at")
+    @classmethod
+    def _as_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # SQLite hands back naive datetimes; they are stored as UTC
+        return ensure_utc(value)
 
-class EventDetail(BaseModel):
-    id: int
-    name: str
-    description: Optional[str] = None
-    image_url: Optional[str] = None
-    location: Optional[str] = None
-    starts_at: Optional[datetime] = None
-    ends_at: Optional[datetime] = None
-    category: Optional[str] = None
-    tags: Optional[str] = None
-    organizer_id: Optional[int] = None
-    is_published: bool = True
-    ticket_types: list[TicketTypeInfo] = []
 
-    class Config:
-        from_attributes = True
+class EventDetail(EventOut):
+    ticket_types: list[TicketTypeInfo] = []
 
 
 # Promo code schemas
@@ -111,10 +116,18 @@ class PromoCodeResponse(BaseModel):
     expires_at: Optional[datetime] = None
     applies_to: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
+
+def from_orm_fast(cls: type[FastORM], obj):
+    """
+    Build a response schema from a trusted DB row without validation.
+    Only for plain schemas: validators and aliases (EventOut, TicketTypeInfo)
+    are skipped by model_construct, so those keep model_validate.
+    """
+    return cls.model_construct(**{f: getattr(obj, f, None) for f in cls.__field_names__})
+
 # Quote and checkout schemas
 class QuoteRequest(BaseModel):
     event_id: int
@@ -160,16 +173,15 @@ class AvailabilityResponse(BaseModel):
 
 # Ticket request schemas
 class TicketRequest(BaseModel):
-    ticket_type: TicketTypeEnum
+    ticket_type: TicketTypeName
     event_id: int = 1  # Default to event_id=1
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "ticket_type": "VIP",
-                "event_id": 1
-            }
+
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "ticket_type": "VIP",
+            "event_id": 1
         }
+    })
 
 
 class TicketRequestResponse(BaseModel):
@@ -185,7 +197,7 @@ class QueuePositionResponse(BaseModel):
 
 
 # Order schemas
-class OrderResponse(BaseModel):
+class OrderResponse(FastORM):
     id: int
     event_id: int
     status: str
@@ -197,8 +209,7 @@ class OrderResponse(BaseModel):
     promo_code: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Ticket verification schemas
@@ -255,7 +266,7 @@ class EventUpdate(BaseModel):
 
 
 class TicketTypeCreate(BaseModel):
-    ticket_type: TicketTypeEnum
+    ticket_type: TicketTypeName
     capacity: int
     price_cents: int
     sale_start: Optional[datetime] = None
@@ -1,23 +1,123 @@
 import os
+import hashlib
 import logging
-from typing import Optional
+from typing import Any, Optional
 
 import httpx
+from pydantic import BaseModel
+
+from event_tix.services.lookup_cache import cached
 
 log = logging.getLogger(__name__)
 
 SEATGEEK_API = "https://api.seatgeek.com/2/events"
+# Identical searches within this window are answered from the lookup cache
+SEARCH_CACHE_TTL_SECONDS = 300
+
+# Shared client so repeat searches reuse pooled connections instead of a new
+# TCP+TLS handshake per call; created on first use, closed at app shutdown
+_http: Optional[httpx.AsyncClient] = None
+
+
+def _get_http() -> httpx.AsyncClient:
+    global _http
+    if _http is None:
+        # One connect retry: a refused/reset connect is retried instead of
+        # dropping the provider's results for this request
+        _http = httpx.AsyncClient(timeout=8.0, transport=httpx.AsyncHTTPTransport(retries=1))
+    return _http
+
+
+async def close_http_client():
+    """Close the shared provider client (app shutdown)"""
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
+
+
+# Thin mirrors of the SeatGeek fields we read; everything else is ignored.
+# Validated straight from the response bytes so the JSON is parsed once.
+class SeatGeekPerformer(BaseModel):
+    images: Any = None  # usually a size -> url dict
+    image: Optional[str] = None
+
+
+class SeatGeekVenue(BaseModel):
+    city: Optional[str] = None
+    state: Optional[str] = None
+    display_location: Optional[str] = None
+
+
+class SeatGeekTaxonomy(BaseModel):
+    name: Optional[str] = None
+    primary: Optional[bool] = None
+
+
+class SeatGeekEvent(BaseModel):
+    id: int
+    title: str
+    type: Optional[str] = None
+    datetime_local: Optional[str] = None
+    url: Optional[str] = None
+    venue: SeatGeekVenue = SeatGeekVenue()
+    performers: list[SeatGeekPerformer] = []
+    taxonomies: list[SeatGeekTaxonomy] = []
 
 
-def search_external_events(keyword: str | None, city: str | None, size: int = 12) -> list[dict]:
+class SeatGeekPayload(BaseModel):
+    events: list[SeatGeekEvent] = []
+
+
+def _map_seatgeek_event(e: SeatGeekEvent) -> dict:
+    """Map one SeatGeek event to the external feed shape"""
+    # Best image: first performer's images dict (prefer "huge"), then its image field
+    best_image_url = None
+    if e.performers:
+        first_performer = e.performers[0]
+        images = first_performer.images
+        if isinstance(images, dict):
+            best_image_url = images.get("huge") or images.get("large") or images.get("medium") or images.get("small")
+        best_image_url = best_image_url or first_performer.image
+
+    venue = e.venue
+    if venue.city and venue.state:
+        location = f"{venue.city}, {venue.state}"
+    else:
+        location = venue.display_location or ""
+
+    # Primary type: the event type, else the taxonomy flagged primary
+    if e.type:
+        primary_type = e.type.title()
+    else:
+        primary_tax = next((tax for tax in e.taxonomies if tax.primary is True), None)
+        primary_type = (primary_tax.name or "General").title() if primary_tax else "General"
+
+    return {
+        "source": "seatgeek",
+        "external_id": e.id,
+        "name": e.title,
+        "image_url": best_image_url,
+        "location": location,
+        "starts_at": e.datetime_local,
+        "url": e.url,
+        "category": primary_type,
+    }
+
+
+async def search_external_events(keyword: str | None, city: str | None, size: int = 12) -> list[dict]:
     """
     Search for events using SeatGeek API.
     Returns empty list if SEATGEEK_CLIENT_ID is missing or on any error.
+    Successful results are cached per (keyword, city, size), with keyword and
+    city trimmed and lowercased so variants of one search share an entry.
     """
     client_id = os.getenv("SEATGEEK_CLIENT_ID")
     if not client_id:
         return []
 
+    keyword = (keyword or "").strip().lower()
+    city = (city or "").strip().lower()
     params = {
         "client_id": client_id,
         "per_page": size,
@@ -27,62 +127,32 @@ def search_external_events(keyword: str | None, city: str | None, size: int = 12
     if city:
         params["venue.city"] = city
 
+    # Free text never goes into the key verbatim: a fixed-size digest keeps
+    # keys short however long the query (entries stay bounded by the cache)
+    digest = hashlib.blake2b(f"{city}\0{keyword}".encode(), digest_size=16).hexdigest()
     try:
-        with httpx.Client(timeout=8.0) as client:
-            response = client.get(SEATGEEK_API, params=params)
-            if response.status_code != 200:
-                log.warning("SeatGeek API returned %s: %s", response.status_code, response.text[:300])
-                return []
-            
-            data = response.json()
-            events = data.get("events", [])
-            
-            result = []
-            for e in events:
-                # Get best image URL
-                best_image_url = None
-                performers = e.get("performers", [])
-                if performers:
-                    first_performer = performers[0]
-                    # Try images dict first (prefer "huge")
-                    if "images" in first_performer and isinstance(first_performer["images"], dict):
-                        best_image_url = first_performer["images"].get("huge") or first_performer["images"].get("large") or first_performer["images"].get("medium") or first_performer["images"].get("small")
-                    # Fall back to image field
-                    if not best_image_url and first_performer.get("image"):
-                        best_image_url = first_performer["image"]
-                
-                # Get location
-                venue = e.get("venue", {})
-                location = None
-                if venue.get("city") and venue.get("state"):
-                    location = f'{venue["city"]}, {venue["state"]}'
-                elif venue.get("display_location"):
-                    location = venue["display_location"]
-                else:
-                    location = ""
-                
-                # Get primary type
-                primary_type = "General"
-                if e.get("type"):
-                    primary_type = e["type"].title()
-                elif e.get("taxonomies"):
-                    for tax in e["taxonomies"]:
-                        if tax.get("primary") is True:
-                            primary_type = tax.get("name", "General").title()
-                            break
-                
-                result.append({
-                    "source": "seatgeek",
-                    "external_id": e["id"],
-                    "name": e["title"],
-                    "image_url": best_image_url,
-                    "location": location,
-                    "starts_at": e.get("datetime_local"),
-                    "url": e.get("url"),
-                    "category": primary_type,
-                })
-            
-            return result
+        result = await cached(
+            f"external:seatgeek:{size}:{digest}",
+            SEARCH_CACHE_TTL_SECONDS,
+            lambda: _fetch_seatgeek(params),
+        )
     except Exception as e:
         log.exception("SeatGeek search failed: %s", e)
         return []
+    return result or []
+
+
+async def _fetch_seatgeek(params: dict) -> list[dict] | None:
+    """One SeatGeek call; None on failure so errors are not cached"""
+    try:
+        response = await _get_http().get(SEATGEEK_API, params=params)
+        if response.status_code != 200:
+            log.warning("SeatGeek API returned %s: %s", response.status_code, response.text[:300])
+            return None
+        
+        payload = SeatGeekPayload.model_validate_json(response.content)
+        
+        return [_map_seatgeek_event(e) for e in payload.events]
+    except Exception as e:
+        log.exception("SeatGeek search failed: %s", e)
+        return None
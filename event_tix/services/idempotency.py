@@ -0,0 +1,39 @@
+import logging
+from typing import Optional
+
+from event_tix.services.redis_client import get_redis
+
+log = logging.getLogger(__name__)
+
+IDEMPOTENCY_TTL_SECONDS = 86400
+
+
+def _key(user_id: int, key: str) -> str:
+    return f"idem:{user_id}:{key}"
+
+
+async def get_cached_response(user_id: int, key: str) -> Optional[bytes]:
+    """
+    Stored response body for an Idempotency-Key from Redis.
+    Returns None on a miss, or when Redis is not configured / unreachable
+    (the idempotency_keys table remains the durable record).
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(_key(user_id, key))
+    except Exception as e:
+        log.warning("Redis idempotency lookup failed: %s", e)
+        return None
+
+
+async def cache_response(user_id: int, key: str, body: bytes):
+    """Remember a committed response body for IDEMPOTENCY_TTL_SECONDS (first writer wins)"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(_key(user_id, key), body, ex=IDEMPOTENCY_TTL_SECONDS, nx=True)
+    except Exception as e:
+        log.warning("Redis idempotency store failed: %s", e)
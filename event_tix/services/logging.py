@@ -1,15 +1,44 @@
+import atexit
 import csv
+import io
+import mmap
 import os
+import queue
+import threading
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 
 CSV_PATH = Path(__file__).parent.parent / "data" / "transactions.csv"
 ERROR_LOG_PATH = Path(__file__).parent.parent / "data" / "errors.log"
 EMAIL_LOG_PATH = Path(__file__).parent.parent / "data" / "emails.log"
 
+# Append handles stay open for the life of the process: path -> open file.
+# Error/email logs are line-buffered; the CSV is flushed once per batch.
+_handles = {}
+_handles_lock = threading.Lock()  # never re-entered: log_error only queues a line
+_csv_writer = None
+_header_ready = False  # header known to be on disk; reset when the CSV handle is dropped
+
+# Every log write is queued as (path, payload) and done in batches by one
+# daemon thread, so callers (the processor loop, request handlers) never wait
+# on disk. Payload is a row tuple for the CSV and a text line otherwise.
+LOG_BATCH_SIZE = 256
+_log_queue: "queue.Queue[tuple]" = queue.Queue()
+_log_thread = None
+_log_thread_lock = threading.Lock()
+
+# CSV columns after the timestamp, pulled from an entry in one C-level call
+_ROW_FIELDS = ('user_name', 'user_email', 'ticket_type', 'request_id', 'status', 'reason')
+_ROW_DEFAULTS = dict.fromkeys(_ROW_FIELDS, '')
+_row_values = itemgetter(*_ROW_FIELDS)
+
 
 def ensure_csv_header():
-    """Ensure CSV file exists with header"""
+    """Ensure CSV file exists with header (checked once per process)"""
+    global _header_ready
+    if _header_ready:
+        return
     CSV_PATH.parent.mkdir(parents=True, exist_ok=True)
     if not CSV_PATH.exists():
         try:
@@ -21,84 +50,174 @@ def ensure_csv_header():
                 ])
         except Exception as e:
             log_error('ensure_csv_header', f"Failed to create CSV header: {e}")
+            return
+    _header_ready = True
+
+
+def _append_handle(path: Path, buffering: int = 1, **kwargs):
+    """Return the cached append handle for path, opening it on first use (hold _handles_lock)"""
+    fh = _handles.get(path)
+    if fh is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fh = _handles[path] = open(path, 'a', buffering=buffering, **kwargs)
+    return fh
+
+
+def _drop_handle(path: Path):
+    """Close and forget a handle after a failed write so the next call reopens it (hold _handles_lock)"""
+    global _csv_writer, _header_ready
+    fh = _handles.pop(path, None)
+    if path == CSV_PATH:
+        # The file may be gone; re-check the header on reopen
+        _csv_writer = None
+        _header_ready = False
+    if fh is not None:
+        try:
+            fh.close()
+        except Exception:
+            pass
+
+
+def _write_line(path: Path, line: str) -> None:
+    with _handles_lock:
+        try:
+            _append_handle(path, encoding='utf-8').write(line)
+        except Exception:
+            _drop_handle(path)
+            raise
+
+
+def _write_rows(rows: list) -> None:
+    """Append a batch of rows to the CSV with one flush; retry once on a fresh file"""
+    global _csv_writer
+    for attempt in range(2):
+        with _handles_lock:
+            try:
+                if _csv_writer is None:
+                    # Header check only when (re)opening, not per row
+                    ensure_csv_header()
+                    _csv_writer = csv.writer(_append_handle(CSV_PATH, buffering=-1, newline=''))
+                _csv_writer.writerows(rows)
+                _handles[CSV_PATH].flush()
+                return
+            except Exception as e:
+                _drop_handle(CSV_PATH)
+                if attempt == 0:
+                    # Retry once
+                    continue
+                # Log error and continue
+                log_error('log_transaction', f"Failed to write {len(rows)} CSV row(s) after retry: {e}")
+                return
+
+
+def _write_lines(path: Path, lines: list) -> None:
+    """Append queued text lines to an error/email log in one write"""
+    text = ''.join(lines)
+    try:
+        _write_line(path, text)
+    except Exception as e:
+        if path == ERROR_LOG_PATH:
+            # If we can't write to error log, print to console
+            print(f"CRITICAL: Failed to write to error log: {e}")
+            print(f"Original error(s):\n{text}", end='')
+        else:
+            log_error('log_email', f"Failed to write to email log: {e}")
+
+
+def _drain_log_queue():
+    while True:
+        batch = [_log_queue.get()]
+        while len(batch) < LOG_BATCH_SIZE:
+            try:
+                batch.append(_log_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            # One write (and one flush) per file per batch, in queued order
+            by_path = {}
+            for path, payload in batch:
+                by_path.setdefault(path, []).append(payload)
+            for path, payloads in by_path.items():
+                if path == CSV_PATH:
+                    _write_rows(payloads)
+                else:
+                    _write_lines(path, payloads)
+        finally:
+            for _ in batch:
+                _log_queue.task_done()
+
+
+def _ensure_log_thread():
+    global _log_thread
+    if _log_thread is not None:
+        return
+    with _log_thread_lock:
+        if _log_thread is None:
+            _log_thread = threading.Thread(target=_drain_log_queue, name="log-writer", daemon=True)
+            _log_thread.start()
+            # Write out whatever is still queued when the process exits normally
+            atexit.register(flush_transactions)
+
+
+def _enqueue(path: Path, payload):
+    _ensure_log_thread()
+    _log_queue.put((path, payload))
+
+
+def flush_transactions():
+    """Block until every queued log write (transactions, errors, emails) is done"""
+    if _log_thread is not None:
+        _log_queue.join()
 
 
 def log_transaction(entry: dict):
     """
-    Log a transaction to CSV.
+    Queue a transaction row for the CSV (written in batches by a background thread).
     entry should contain: user_name, user_email, ticket_type, request_id, status, reason
     """
-    ensure_csv_header()
     timestamp = datetime.utcnow().isoformat()
-    
-    row = [
-        timestamp,
-        entry.get('user_name', ''),
-        entry.get('user_email', ''),
-        entry.get('ticket_type', ''),
-        entry.get('request_id', ''),
-        entry.get('status', ''),
-        entry.get('reason', '')
-    ]
-    
-    # Retry once on failure
-    for attempt in range(2):
-        try:
-            with open(CSV_PATH, 'a', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(row)
-            return
-        except Exception as e:
-            if attempt == 0:
-                # Retry once
-                continue
-            else:
-                # Log error and continue
-                log_error('log_transaction', f"Failed to write CSV after retry: {e}")
-                return
+    _enqueue(CSV_PATH, (timestamp, *_row_values({**_ROW_DEFAULTS, **entry})))
 
 
 def log_error(context: str, message: str):
-    """Log an error to errors.log"""
-    ERROR_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    """Queue an error line for errors.log (written by the background thread)"""
     timestamp = datetime.utcnow().isoformat()
-    
-    try:
-        with open(ERROR_LOG_PATH, 'a', encoding='utf-8') as f:
-            f.write(f"[{timestamp}] [{context}] {message}\n")
-    except Exception as e:
-        # If we can't write to error log, print to console
-        print(f"CRITICAL: Failed to write to error log: {e}")
-        print(f"Original error: [{context}] {message}")
+    _enqueue(ERROR_LOG_PATH, f"[{timestamp}] [{context}] {message}\n")
 
 
 def get_last_transactions(n: int = 10) -> list:
-    """Get last N transactions from CSV"""
+    """Get last N transactions from CSV (reads only the header and the tail)"""
+    flush_transactions()  # include rows this process has queued but not yet written
     if not CSV_PATH.exists():
         return []
     
     try:
-        transactions = []
-        with open(CSV_PATH, 'r', newline='') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-            # Get last N rows
-            for row in rows[-n:]:
-                transactions.append(row)
+        with open(CSV_PATH, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                header_end = mm.find(b"\n")
+                if header_end == -1:
+                    return []
+                fieldnames = next(csv.reader([mm[:header_end].decode('utf-8')]))
+                
+                # Walk back from EOF one newline per row until N rows are covered
+                start = len(mm)
+                if mm[start - 1:start] == b"\n":
+                    start -= 1
+                for _ in range(n):
+                    if start <= header_end:
+                        break
+                    start = mm.rfind(b"\n", header_end, start)
+                tail = mm[start + 1:].decode('utf-8')
         
-        return transactions
+        return list(csv.DictReader(io.StringIO(tail, newline=''), fieldnames=fieldnames))
     except Exception as e:
         log_error('get_last_transactions', f"Failed to read transactions: {e}")
         return []
 
 
 def log_email(to: str, subject: str, order_id: int):
-    """Log an email to emails.log"""
-    EMAIL_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    """Queue an email line for emails.log (written by the background thread)"""
     timestamp = datetime.utcnow().isoformat()
-    
-    try:
-        with open(EMAIL_LOG_PATH, 'a', encoding='utf-8') as f:
-            f.write(f"[{timestamp}] To: {to} | Subject: {subject} | Order ID: {order_id}\n")
-    except Exception as e:
-        log_error('log_email', f"Failed to write to email log: {e}")
+    _enqueue(EMAIL_LOG_PATH, f"[{timestamp}] To: {to} | Subject: {subject} | Order ID: {order_id}\n")
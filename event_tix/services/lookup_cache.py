@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Tuple
+
+import orjson
+
+from event_tix.services.redis_client import get_redis
+
+# Read-through cache for read-mostly data (events, ticket-type ids, promos,
+# external provider searches).
+# Values must be JSON-serializable. Uses Redis when REDIS_URL is set, otherwise
+# a per-process LRU: key -> (expires_at, value), least recently used first
+LOCAL_CACHE_MAX_ENTRIES = 1024
+_local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+LOCK_TTL_MS = 5000
+# A caller that loses the rebuild race re-checks this often, this many times,
+# before loading on its own
+LOCK_WAIT_SECONDS = 0.05
+LOCK_WAIT_TRIES = 10
+
+# Release the rebuild lock only if it still holds this caller's token (it may
+# have expired and been taken by someone else meanwhile)
+RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_release_script = None
+
+log = logging.getLogger(__name__)
+
+
+async def cached(key: str, ttl: int, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return the cached value for key, or run loader() and cache its result
+    for ttl seconds. None results are not cached.
+    """
+    client = get_redis()
+    if client is None:
+        entry = _local.get(key)
+        if entry and entry[0] > time.monotonic():
+            _local.move_to_end(key)
+            return entry[1]
+        value = await loader()
+        if value is not None:
+            _store_local(key, ttl, value)
+        return value
+
+    lock_key = f"lock:{key}"
+    token = secrets.token_hex(8)
+    try:
+        hit = await client.get(key)
+        if hit is not None:
+            return orjson.loads(hit)
+        # Stampede guard: one caller rebuilds, the rest wait for its result
+        acquired = await client.set(lock_key, token, nx=True, px=LOCK_TTL_MS)
+        for _ in range(0 if acquired else LOCK_WAIT_TRIES):
+            await asyncio.sleep(LOCK_WAIT_SECONDS)
+            hit = await client.get(key)
+            if hit is not None:
+                return orjson.loads(hit)
+    except Exception as e:
+        log.warning("Redis lookup cache unavailable: %s", e)
+        return await loader()
+
+    try:
+        value = await loader()
+        if value is not None:
+            try:
+                await client.set(key, orjson.dumps(value), ex=ttl)
+            except Exception as e:
+                # The loaded value is still good; the next caller just rebuilds it
+                log.warning("Redis lookup cache write failed: %s", e)
+        return value
+    finally:
+        if acquired:
+            await _release_lock(client, lock_key, token)
+
+
+def _store_local(key: str, ttl: int, value: Any):
+    """Insert into the local LRU; when full, drop expired entries first, then the oldest"""
+    _local.pop(key, None)
+    if len(_local) >= LOCAL_CACHE_MAX_ENTRIES:
+        now = time.monotonic()
+        for stale in [k for k, (expires_at, _) in _local.items() if expires_at <= now]:
+            del _local[stale]
+        while len(_local) >= LOCAL_CACHE_MAX_ENTRIES:
+            _local.popitem(last=False)
+    _local[key] = (time.monotonic() + ttl, value)
+
+
+async def _release_lock(client, lock_key: str, token: str):
+    global _release_script
+    try:
+        if _release_script is None:
+            _release_script = client.register_script(RELEASE_LOCK_LUA)
+        await _release_script(keys=[lock_key], args=[token])
+    except Exception:
+        pass  # the lock expires on its own after LOCK_TTL_MS
+
+
+async def invalidate(*keys: str):
+    """Drop cached entries after a write"""
+    for key in keys:
+        _local.pop(key, None)
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.delete(*keys)
+    except Exception as e:
+        log.warning("Redis lookup cache invalidation failed: %s", e)
@@ -1,144 +1,235 @@
 import asyncio
+import logging
+from typing import Optional
+from sqlalchemy import bindparam, insert, select, update
 from sqlalchemy.orm import Session
-from event_tix.db import SessionLocal, atomic_reserve_ticket_type
-from event_tix.models import Order, Ticket, TicketTypeEnum
-from event_tix.services.queue import dequeue, mark_done, remove_from_tracker
+from event_tix.db import AsyncSessionLocal, SessionLocal, atomic_reserve_ticket_types
+from event_tix.models import Order, Ticket, TicketType, User
+from event_tix.services.queue import dequeue_batch, finish_requests, requeue_front, restore_queued
 from event_tix.services.logging import log_transaction, log_error
-import uuid
+from event_tix.services.lookup_cache import cached
+from event_tix.services.response_cache import bump_epoch
+import secrets
+
+log = logging.getLogger(__name__)
+
+# Up to this many queued requests are settled per tick, with one set of
+# lookups and one commit; a full batch starts the next tick immediately.
+BATCH_MAX = 64
+# Enqueues and freed seats wake the loop directly; this idle poll only picks
+# up work nobody signalled (e.g. requests queued in Redis by another process)
+IDLE_POLL_SECONDS = 5.0
+
+# Each still-queued order with its user in one round trip; the outer join
+# keeps the order row when the user is missing so it can be failed. Orders
+# already settled (e.g. a request restored twice) are left out. Ticket type
+# ids come from the lookup cache (see _ticket_type_ids), not a join.
+ORDERS_WITH_USER = (
+    select(Order, User)
+    .outerjoin(User, User.id == Order.user_id)
+    .where(
+        Order.request_id.in_(bindparam("request_ids", expanding=True)),
+        Order.status == 'queued',
+    )
+)
+
+# Orders that may have lost their queue entry (in-memory queue on a restart,
+# a worker dying mid-tick): still 'queued', oldest first
+QUEUED_ORDERS = (
+    select(Order.request_id, Order.user_id, Order.event_id, Order.ticket_type)
+    .where(Order.status == 'queued', Order.request_id.is_not(None))
+    .order_by(Order.id)
+)
 
 _processing_task = None
 _processing_enabled = False
+# Wake-ups for the processor loop: one item per new request or freed seat
+# (e.g. a cancel), so it is served right away instead of at the idle poll.
+# Created by the running loop; None while no processor is running.
+_wakeups: Optional["asyncio.Queue[int]"] = None
 
 
-async def process_tick():
-    """Process one iteration of the queue"""
-    db = SessionLocal()
-    try:
-        # Dequeue next request (VIP first, then Regular)
-        entry = dequeue()
-        if entry is None:
-            return  # No requests in queue
-        
-        request_id = entry['request_id']
-        user_id = entry['user_id']
-        event_id = entry['event_id']
-        ticket_type_name = entry['ticket_type_name']
-        ticket_type = TicketTypeEnum.VIP if ticket_type_name == 'VIP' else TicketTypeEnum.REGULAR
-        
-        # Find existing order by request_id
-        order = db.query(Order).filter(Order.request_id == request_id).first()
+async def _ticket_type_ids(event_id: int) -> dict:
+    """
+    Ticket type value ('VIP'/'Regular') -> ticket_types.id for an event.
+    Shares the app's "event:{id}:ttypes" cache entry, which is invalidated when
+    a ticket type is added; seat counts are never cached, the reserve UPDATE
+    reads them. Misses load through the async engine, off the event loop.
+    """
+    async def load():
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(TicketType.ticket_type, TicketType.id).where(TicketType.event_id == event_id)
+            )).all()
+        return {tt.value: tt_id for tt, tt_id in rows}
+    return await cached(f"event:{event_id}:ttypes", 300, load)
+
+
+def process_batch(db: Session, entries: list, ticket_type_ids: dict) -> bool:
+    """
+    Settle a batch of dequeued requests: load their orders with users in one
+    query, reserve seats once per ticket type, then write tickets and order
+    statuses in bulk and commit once. ticket_type_ids maps event id -> the
+    _ticket_type_ids dict for that event. Returns True if any order was
+    confirmed (cached availability is then stale).
+    The caller forgets the entries once this returns.
+    """
+    rows = {
+        order.request_id: (order, user)
+        for order, user in db.execute(
+            ORDERS_WITH_USER, {"request_ids": [entry.request_id for entry in entries]}
+        )
+    }
+
+    outcomes = []  # (entry, user, status, reason) in dequeue order
+    groups = {}  # ticket_type id -> [(entry, order, user)], VIP/arrival order kept
+    confirmed_ids = []
+    failed_ids = {}  # reason -> [order id]
+    for entry in entries:
+        request_id = entry.request_id
+
+        order, user = rows.get(request_id, (None, None))
         if not order:
-            log_error('process_tick', f"Order not found for request_id: {request_id}")
-            remove_from_tracker(request_id)
-            return
-        
-        # Get user info for logging
-        from event_tix.models import User
-        user = db.query(User).filter(User.id == user_id).first()
+            log_error('process_tick', f"No queued order for request_id: {request_id}")
+            continue
+
         if not user:
-            order.status = 'failed'
-            order.reason = 'user_not_found'
-            db.commit()
-            log_transaction({
-                'user_name': f'user_{user_id}',
-                'user_email': 'unknown',
-                'ticket_type': ticket_type_name,
-                'request_id': request_id,
-                'status': 'failed',
-                'reason': 'user_not_found'
-            })
-            mark_done(request_id)
-            remove_from_tracker(request_id)
-            return
-        
-        # Get ticket type record
-        from event_tix.models import TicketType
-        ticket_type_record = db.query(TicketType).filter(
-            TicketType.ticket_type == ticket_type,
-            TicketType.event_id == event_id
-        ).first()
-        
-        if not ticket_type_record:
-            order.status = 'failed'
-            order.reason = 'ticket_type_not_found'
-            db.commit()
-            log_transaction({
-                'user_name': user.name,
-                'user_email': user.email,
-                'ticket_type': ticket_type_name,
-                'request_id': request_id,
-                'status': 'failed',
-                'reason': 'ticket_type_not_found'
-            })
-            mark_done(request_id)
-            remove_from_tracker(request_id)
-            return
-        
-        # Try atomic reservation
-        success = atomic_reserve_ticket_type(db, ticket_type_record.id)
-        
-        if success:
-            # Refresh to get updated sold_count
-            db.refresh(ticket_type_record)
-            
-            # Update order to confirmed
-            order.status = 'confirmed'
-            db.flush()
-            
-            # Create ticket with QR token
-            qr_token = str(uuid.uuid4())
-            ticket = Ticket(
-                order_id=order.id,
-                qr_token=qr_token
-            )
-            db.add(ticket)
-            db.commit()
-            
-            log_transaction({
-                'user_name': user.name,
-                'user_email': user.email,
-                'ticket_type': ticket_type_name,
-                'request_id': request_id,
-                'status': 'confirmed',
-                'reason': ''
-            })
-        else:
-            # Update order to failed
-            order.status = 'failed'
-            order.reason = 'sold_out'
-            db.commit()
-            
-            log_transaction({
-                'user_name': user.name,
-                'user_email': user.email,
-                'ticket_type': ticket_type_name,
-                'request_id': request_id,
-                'status': 'failed',
-                'reason': 'sold_out'
-            })
-        
-        mark_done(request_id)
-        remove_from_tracker(request_id)
-        
-    except Exception as e:
+            failed_ids.setdefault('user_not_found', []).append(order.id)
+            outcomes.append((entry, None, 'failed', 'user_not_found'))
+            continue
+
+        ticket_type_id = ticket_type_ids.get(order.event_id, {}).get(order.ticket_type.value)
+        if not ticket_type_id:
+            failed_ids.setdefault('ticket_type_not_found', []).append(order.id)
+            outcomes.append((entry, user, 'failed', 'ticket_type_not_found'))
+            continue
+
+        groups.setdefault(ticket_type_id, []).append((entry, order, user))
+
+    # One guarded increment per ticket type; the earliest requests get the seats
+    for ticket_type_id, group in groups.items():
+        granted = atomic_reserve_ticket_types(db, ticket_type_id, len(group))
+        for idx, (entry, order, user) in enumerate(group):
+            if idx < granted:
+                confirmed_ids.append(order.id)
+                outcomes.append((entry, user, 'confirmed', ''))
+            else:
+                failed_ids.setdefault('sold_out', []).append(order.id)
+                outcomes.append((entry, user, 'failed', 'sold_out'))
+
+    # One multi-row INSERT for the tickets and one UPDATE per outcome, instead
+    # of a statement per order; the commit below expires the loaded rows
+    if confirmed_ids:
+        db.execute(insert(Ticket), [
+            {'order_id': order_id, 'qr_token': secrets.token_urlsafe(16)} for order_id in confirmed_ids
+        ])
+        db.execute(
+            update(Order).where(Order.id.in_(confirmed_ids)).values(status='confirmed'),
+            execution_options={'synchronize_session': False},
+        )
+    for reason, order_ids in failed_ids.items():
+        db.execute(
+            update(Order).where(Order.id.in_(order_ids)).values(status='failed', reason=reason),
+            execution_options={'synchronize_session': False},
+        )
+
+    db.commit()
+
+    for entry, user, status, reason in outcomes:
+        log_transaction({
+            'user_name': user.name if user else f"user_{entry.user_id}",
+            'user_email': user.email if user else 'unknown',
+            'ticket_type': entry.ticket_type_name,
+            'request_id': entry.request_id,
+            'status': status,
+            'reason': reason
+        })
+    return bool(confirmed_ids)
+
+
+def _settle_batch(entries: list, ticket_type_ids: dict) -> bool:
+    """
+    Run process_batch on a session owned by the calling worker thread, so the
+    sync SQLite writes (and any busy_timeout wait for the write lock) never
+    block the event loop. Rolls back and re-raises on failure.
+    """
+    db = SessionLocal()
+    try:
+        return process_batch(db, entries, ticket_type_ids)
+    except Exception:
         db.rollback()
-        log_error('process_tick', f"Error processing tick: {e}")
-        print(f"Error processing tick: {e}")
+        raise
     finally:
         db.close()
 
 
+async def process_tick() -> int:
+    """Process one batch from the queue; returns how many requests were settled"""
+    # Dequeue up to BATCH_MAX requests (VIP first, then Regular)
+    entries = await dequeue_batch(BATCH_MAX)
+    if not entries:
+        return 0  # No requests in queue
+
+    try:
+        ticket_type_ids = {}
+        for entry in entries:
+            event_id = entry.event_id
+            if event_id not in ticket_type_ids:
+                ticket_type_ids[event_id] = await _ticket_type_ids(event_id)
+        confirmed = await asyncio.to_thread(_settle_batch, entries, ticket_type_ids)
+    except Exception as e:
+        log_error('process_tick', f"Error processing tick: {e}")
+        # Nothing was committed: put the batch back so the next tick retries it
+        await requeue_front(entries)
+        return 0  # don't retry straight away; wait for the next wake-up or poll
+    if confirmed:
+        # sold_count moved: cached event detail/availability payloads are stale
+        bump_epoch()
+    await finish_requests([entry.request_id for entry in entries])
+    return len(entries)
+
+
+async def recover_queued_orders() -> int:
+    """
+    Re-queue orders left 'queued' in the database whose queue entry is gone:
+    the in-memory queue does not survive a restart, and a worker that dies
+    mid-tick strands its claimed Redis entries. Requests still waiting in (or
+    live-claimed from) the shared queue are skipped. Returns how many were restored.
+    """
+    async with AsyncSessionLocal() as db:
+        requests = (await db.execute(QUEUED_ORDERS)).all()
+    return await restore_queued(requests)
+
+
 async def run_processor(app_state=None):
-    """Background processing loop (500ms tick)"""
-    global _processing_enabled
+    """Background processing loop: drains on every wake-up, polls when idle"""
+    global _processing_enabled, _wakeups
     _processing_enabled = True
+    _wakeups = asyncio.Queue()
     try:
+        try:
+            restored = await recover_queued_orders()
+            if restored:
+                log.info("Re-queued %d order(s) left queued before the restart", restored)
+        except Exception as e:
+            log_error('run_processor', f"Failed to recover queued orders: {e}")
         while _processing_enabled:
-            await process_tick()
-            await asyncio.sleep(0.5)  # 500ms
+            if await process_tick() >= BATCH_MAX:
+                # More may be waiting: yield to the loop once, then drain again
+                await asyncio.sleep(0)
+                continue
+            try:
+                await asyncio.wait_for(_wakeups.get(), timeout=IDLE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            # One tick serves every wake-up that arrived meanwhile
+            while not _wakeups.empty():
+                _wakeups.get_nowait()
     except asyncio.CancelledError:
         _processing_enabled = False
         raise
+    finally:
+        _wakeups = None
 
 
 async def processing_loop():
@@ -150,12 +241,7 @@ def start_processing():
     """Start background processing task"""
     global _processing_task
     if _processing_task is None or _processing_task.done():
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        _processing_task = loop.create_task(processing_loop())
+        _processing_task = asyncio.get_running_loop().create_task(processing_loop())
 
 
 def stop_processing():
@@ -172,6 +258,13 @@ def set_processing_enabled(value: bool):
     _processing_enabled = value
 
 
+def notify_processor(event_id: int):
+    """Ask the running processor loop for an immediate tick (call from the event loop
+    once the queued order is committed, so the tick can find it)"""
+    if _wakeups is not None:
+        _wakeups.put_nowait(event_id)
+
+
 async def process_one_manual():
     """Manually process one tick (for CLI)"""
     await process_tick()
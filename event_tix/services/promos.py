@@ -1,51 +1,98 @@
 # event_tix/services/promos.py
+import time
+from functools import lru_cache
 from datetime import datetime, timezone
+from typing import Any, Dict, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from event_tix.models.promo import PromoCode, PromoRedemption
 
+# Short-lived snapshots of promo rows for the read-only validate endpoint,
+# which checkout UIs call on every step: normalized code -> (expires_at, row).
+# Checkout itself always reads the live row so usage limits stay exact.
+PROMO_CACHE_TTL_SECONDS = 30
+PROMO_CACHE_MAX_ENTRIES = 1024
+_promo_cache: Dict[str, Tuple[float, Any]] = {}
+
 def _now_utc():
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
+@lru_cache(maxsize=1024)
 def normalize(code: str) -> str:
     return (code or "").strip().upper()
 
+def invalidate_promo_cache():
+    """Drop cached promo snapshots (call after promo writes)"""
+    _promo_cache.clear()
+
+def _lookup_promo(db: Session, codeN: str, use_cache: bool):
+    if not use_cache:
+        return db.query(PromoCode).filter(func.upper(PromoCode.code) == codeN).first()
+    entry = _promo_cache.get(codeN)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    # Plain column row: immutable, detached from the session, attribute access like the model
+    promo = db.execute(
+        select(*PromoCode.__table__.c).where(func.upper(PromoCode.code) == codeN)
+    ).first()
+    if len(_promo_cache) >= PROMO_CACHE_MAX_ENTRIES:
+        _promo_cache.clear()
+    _promo_cache[codeN] = (time.monotonic() + PROMO_CACHE_TTL_SECONDS, promo)
+    return promo
+
 def validate_promo(db: Session, *, code: str, user_id: int | None, event_id: int, ticket_type: str, qty: int, unit_price_cents: int):
+    ok, msg, discount, new_total, _ = evaluate_promo(
+        db, code=code, user_id=user_id, event_id=event_id,
+        ticket_type=ticket_type, qty=qty, unit_price_cents=unit_price_cents,
+        use_cache=True,
+    )
+    return (ok, msg, discount, new_total)
+
+def evaluate_promo(db: Session, *, code: str, user_id: int | None, event_id: int, ticket_type: str, qty: int, unit_price_cents: int, now: datetime | None = None, use_cache: bool = False):
+    """Same as validate_promo, plus the applied PromoCode (None when not valid).
+    use_cache serves the promo row from a ~30s snapshot; leave it off wherever the
+    result gates a purchase."""
+    line_total = unit_price_cents * qty
     codeN = normalize(code)
     if not codeN:
-        return (False, "Empty promo code", 0, qty * unit_price_cents)
+        return (False, "Empty promo code", 0, line_total, None)
 
-    promo = db.query(PromoCode).filter(func.upper(PromoCode.code) == codeN).first()
+    promo = _lookup_promo(db, codeN, use_cache)
     if not promo or not promo.is_active:
-        return (False, "Invalid promo code", 0, qty * unit_price_cents)
+        return (False, "Invalid promo code", 0, line_total, None)
 
     # scope checks
     if promo.event_id and promo.event_id != event_id:
-        return (False, "Promo not valid for this event", 0, qty * unit_price_cents)
+        return (False, "Promo not valid for this event", 0, line_total, None)
     if promo.ticket_type and promo.ticket_type != ticket_type:
-        return (False, "Promo not valid for this ticket type", 0, qty * unit_price_cents)
+        return (False, "Promo not valid for this ticket type", 0, line_total, None)
 
-    now = _now_utc()
+    now = now or _now_utc()
     if promo.starts_at and now < promo.starts_at:
-        return (False, "Promo not started yet", 0, qty * unit_price_cents)
+        return (False, "Promo not started yet", 0, line_total, None)
     if promo.ends_at and now > promo.ends_at:
-        return (False, "Promo expired", 0, qty * unit_price_cents)
+        return (False, "Promo expired", 0, line_total, None)
 
     # limits
     if promo.max_total_uses is not None and promo.used_count >= promo.max_total_uses:
-        return (False, "Promo usage limit reached", 0, qty * unit_price_cents)
+        return (False, "Promo usage limit reached", 0, line_total, None)
 
     if user_id is not None and promo.max_uses_per_user:
-        used_by_user = db.query(PromoRedemption).filter(
-            PromoRedemption.promo_id == promo.id,
-            PromoRedemption.user_id == user_id
-        ).count()
+        # Only "at least max_uses_per_user?" matters, so stop counting there:
+        # an index-only probe on idx_prom_red_promo_user (an EXISTS when the limit is 1)
+        used_by_user = db.execute(
+            select(func.count()).select_from(
+                select(PromoRedemption.id).where(
+                    PromoRedemption.promo_id == promo.id,
+                    PromoRedemption.user_id == user_id
+                ).limit(promo.max_uses_per_user).subquery()
+            )
+        ).scalar()
         if used_by_user >= promo.max_uses_per_user:
-            return (False, "You have already used this promo", 0, qty * unit_price_cents)
+            return (False, "You have already used this promo", 0, line_total, None)
 
-    line_total = unit_price_cents * qty
     if promo.min_order_cents and line_total < promo.min_order_cents:
-        return (False, "Order total too low for this promo", 0, line_total)
+        return (False, "Order total too low for this promo", 0, line_total, None)
 
     # discount
     discount = 0
@@ -55,13 +102,15 @@ def validate_promo(db: Session, *, code: str, user_id: int | None, event_id: int
         discount = min(promo.amount_off_cents, line_total)
 
     new_total = max(0, line_total - discount)
-    return (True, "Promo applied", discount, new_total)
+    return (True, "Promo applied", discount, new_total, promo)
 
 def redeem_promo(db: Session, *, promo_code: str, user_id: int, order_id: int):
     codeN = normalize(promo_code)
     promo = db.query(PromoCode).filter(func.upper(PromoCode.code) == codeN).first()
     if not promo:
         return
+    # used_count changes: the validate endpoint must not keep the old snapshot
+    _promo_cache.pop(codeN, None)
     promo.used_count = (promo.used_count or 0) + 1
     red = PromoRedemption(promo_id=promo.id, user_id=user_id, order_id=order_id)
     db.add(red)
@@ -1,15 +1,35 @@
 from collections import deque
-from typing import Dict, Optional, Tuple
-from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from event_tix.models import TicketTypeEnum
-import uuid
+from event_tix.services.queue_redis import (
+    redis_dequeue_batch, redis_enqueue, redis_finish, redis_get_position, redis_get_status,
+    redis_requeue_front, redis_restore,
+)
+import secrets
+import time
+
+# The queue is shared through Redis when REDIS_URL is set, so any worker can
+# enqueue, serve or report on a request; otherwise (or if Redis is down) the
+# in-memory queues below are used and each process keeps its own queue.
+
+
+class QueueEntry(NamedTuple):
+    """One queued request; a tuple, so ~half the memory of the dict it replaces"""
+    request_id: str
+    user_id: int
+    event_id: int
+    ticket_type_name: str  # TicketTypeEnum value: one shared string per tier
+    arrival_counter: int = 0
+    created_at_ns: int = 0  # wall clock, for reporting; arrival_counter orders
+    queue_seq: int = 0  # position bookkeeping for the in-memory queues
+
 
 # In-memory queues
 vip_queue: deque = deque()
 regular_queue: deque = deque()
 
-# Track request_id -> queue entry dict
-request_tracker: Dict[str, dict] = {}
+# Track request_id -> queue entry
+request_tracker: Dict[str, QueueEntry] = {}
 
 # Track processing status: request_id -> status
 processing_status: Dict[str, str] = {}  # "queued", "processing", "done"
@@ -17,85 +37,163 @@ processing_status: Dict[str, str] = {}  # "queued", "processing", "done"
 # Global arrival counter
 _arrival_counter = 0
 
+# Per-queue sequence numbers: the next one handed out at enqueue, and the one
+# at the head. Entries only leave from the head, so a queued entry's position
+# is its sequence number minus the head's, plus one.
+_queue_tail: Dict[str, int] = {'VIP': 0, 'Regular': 0}
+_queue_head: Dict[str, int] = {'VIP': 0, 'Regular': 0}
+
+
+def new_request_id() -> str:
+    """Id for a new ticket request; create its order with it before enqueueing"""
+    return secrets.token_hex(16)
+
 
-def enqueue(user_id: int, event_id: int, ticket_type: TicketTypeEnum) -> Tuple[str, int]:
+async def enqueue(user_id: int, event_id: int, ticket_type: TicketTypeEnum, request_id: Optional[str] = None) -> Tuple[str, int]:
     """
-    Enqueue a ticket request.
+    Enqueue a ticket request. Pass the request_id of an order that is already
+    committed, so the processor always finds it (a new id is made otherwise).
     Returns (request_id, position_in_queue)
     """
     global _arrival_counter
     _arrival_counter += 1
     
-    request_id = str(uuid.uuid4())
-    created_at = datetime.utcnow()
+    request_id = request_id or new_request_id()
+    entry = QueueEntry(request_id, user_id, event_id, ticket_type.value, _arrival_counter, time.time_ns())
     
-    entry = {
-        'request_id': request_id,
-        'user_id': user_id,
-        'event_id': event_id,
-        'ticket_type_name': ticket_type.value,
-        'arrival_counter': _arrival_counter,
-        'created_at': created_at
-    }
+    position = await redis_enqueue(entry)
+    if position is not None:
+        return request_id, position
     
-    if ticket_type == TicketTypeEnum.VIP:
+    return request_id, _push_local(entry)
+
+
+def _push_local(entry: QueueEntry) -> int:
+    """Append an entry to its in-memory queue; returns its position"""
+    entry = entry._replace(queue_seq=_queue_tail[entry.ticket_type_name])
+    _queue_tail[entry.ticket_type_name] += 1
+    if entry.ticket_type_name == TicketTypeEnum.VIP.value:
         position = len(vip_queue) + 1
         vip_queue.append(entry)
     else:
         position = len(regular_queue) + 1
         regular_queue.append(entry)
     
-    request_tracker[request_id] = entry
-    processing_status[request_id] = 'queued'
+    request_tracker[entry.request_id] = entry
+    processing_status[entry.request_id] = 'queued'
+    return position
+
+
+async def restore_queued(requests: List[Tuple[str, int, int, TicketTypeEnum]]) -> int:
+    """
+    Put already-persisted requests (request_id, user_id, event_id, ticket_type)
+    back in the queue, e.g. orders still 'queued' after a restart. The shared
+    queue skips ones it still holds; without Redis, ones already tracked here
+    are skipped. Returns how many were restored.
+    """
+    global _arrival_counter
+    entries = []
+    for request_id, user_id, event_id, ticket_type in requests:
+        _arrival_counter += 1
+        entries.append(QueueEntry(request_id, user_id, event_id, ticket_type.value, _arrival_counter, time.time_ns()))
+    
+    restored = await redis_restore(entries)
+    if restored is not None:
+        return restored
     
-    return request_id, position
+    restored = 0
+    for entry in entries:
+        if entry.request_id not in request_tracker:
+            _push_local(entry)
+            restored += 1
+    return restored
 
 
-def dequeue() -> Optional[dict]:
+def dequeue() -> Optional[QueueEntry]:
     """
     Dequeue next request (VIP first, then Regular).
-    Returns queue entry dict or None if both queues empty.
+    Returns the queue entry or None if both queues empty.
     """
     if vip_queue:
         entry = vip_queue.popleft()
-        processing_status[entry['request_id']] = 'processing'
-        return entry
     elif regular_queue:
         entry = regular_queue.popleft()
-        processing_status[entry['request_id']] = 'processing'
-        return entry
-    return None
+    else:
+        return None
+    _queue_head[entry.ticket_type_name] = entry.queue_seq + 1
+    processing_status[entry.request_id] = 'processing'
+    return entry
 
 
-def get_position(request_id: str) -> Optional[Tuple[int, TicketTypeEnum]]:
+async def dequeue_batch(max_entries: int) -> List[QueueEntry]:
+    """
+    Dequeue up to max_entries requests (VIP first, then Regular).
+    Drains the local queues first, e.g. entries queued while Redis was down.
+    """
+    entries = []
+    while len(entries) < max_entries:
+        entry = dequeue()
+        if entry is None:
+            break
+        entries.append(entry)
+    if len(entries) < max_entries:
+        shared = await redis_dequeue_batch(max_entries - len(entries)) or []
+        entries += [QueueEntry(**fields) for fields in shared]
+    return entries
+
+
+async def requeue_front(entries: List[QueueEntry]):
+    """
+    Put dequeued entries back at the head of their queues in their original
+    order, e.g. when a tick fails before committing. Entries that came from the
+    in-memory queue go back there; shared ones go back to Redis (or, if it is
+    unreachable, to the in-memory queue).
+    """
+    local = [entry for entry in entries if entry.request_id in request_tracker]
+    shared = [entry for entry in entries if entry.request_id not in request_tracker]
+    if shared and not await redis_requeue_front(shared):
+        local += shared
+    for entry in reversed(local):
+        # Step the head back so positions stay seq - head + 1
+        _queue_head[entry.ticket_type_name] -= 1
+        entry = entry._replace(queue_seq=_queue_head[entry.ticket_type_name])
+        if entry.ticket_type_name == TicketTypeEnum.VIP.value:
+            vip_queue.appendleft(entry)
+        else:
+            regular_queue.appendleft(entry)
+        request_tracker[entry.request_id] = entry
+        processing_status[entry.request_id] = 'queued'
+
+
+async def get_position(request_id: str) -> Optional[Tuple[int, TicketTypeEnum]]:
     """
     Get current position in queue for a request_id.
     Returns (position, ticket_type) or None if not found.
     """
     if request_id not in request_tracker:
-        return None
+        shared = await redis_get_position(request_id)
+        if not shared or not shared[0]:
+            return None
+        _, position, ticket_type_name = shared
+        return position, TicketTypeEnum(ticket_type_name)
     
     entry = request_tracker[request_id]
-    ticket_type_name = entry['ticket_type_name']
+    ticket_type_name = entry.ticket_type_name
     ticket_type = TicketTypeEnum.VIP if ticket_type_name == 'VIP' else TicketTypeEnum.REGULAR
     
-    # Recalculate position based on current queue state
-    if ticket_type == TicketTypeEnum.VIP:
-        for idx, item in enumerate(vip_queue, start=1):
-            if item['request_id'] == request_id:
-                return idx, ticket_type
-    else:
-        for idx, item in enumerate(regular_queue, start=1):
-            if item['request_id'] == request_id:
-                return idx, ticket_type
-    
-    # Not in queue anymore (being processed or done)
-    return None
+    # O(1): distance from the head of this entry's queue
+    position = entry.queue_seq - _queue_head[ticket_type_name] + 1
+    if position < 1:
+        # Not in queue anymore (being processed or done)
+        return None
+    return position, ticket_type
 
 
-def get_status(request_id: str) -> str:
+async def get_status(request_id: str) -> str:
     """Get processing status for a request_id"""
-    return processing_status.get(request_id, 'unknown')
+    if request_id in processing_status:
+        return processing_status[request_id]
+    return await redis_get_status(request_id) or 'unknown'
 
 
 def mark_done(request_id: str):
@@ -111,3 +209,10 @@ def remove_from_tracker(request_id: str):
         del request_tracker[request_id]
     if request_id in processing_status:
         del processing_status[request_id]
+
+
+async def finish_requests(request_ids: List[str]):
+    """Forget finished requests, locally and in the shared queue"""
+    for request_id in request_ids:
+        remove_from_tracker(request_id)
+    await redis_finish(request_ids)
@@ -0,0 +1,240 @@
+import logging
+import time
+from typing import List, Optional
+
+from event_tix.services.redis_client import get_redis
+
+log = logging.getLogger(__name__)
+
+# Shared ticket queue for multi-worker deployments. Each tier is a Redis list
+# of request ids (RPUSH to join, LPOP to serve, LPOS for the position), and
+# each request's entry lives in a hash that expires if it is never served.
+QUEUE_KEYS = {"VIP": "queue:vip", "Regular": "queue:regular"}
+REQUEST_TTL_SECONDS = 24 * 3600
+# A request claimed by a tick this long ago and never finished belongs to a
+# worker that died mid-tick; a restarting worker may put it back in the queue
+STALE_CLAIM_SECONDS = 60
+
+# Pop up to ARGV[1] ids, VIP first, and mark each processing (claimed at
+# ARGV[2] ms) in the same atomic step, so concurrent workers never share an
+# entry. Returns {id, fields, ...}.
+DEQUEUE_BATCH_LUA = """
+local max_entries = tonumber(ARGV[1])
+local out = {}
+local taken = 0
+for _, queue in ipairs(KEYS) do
+    while taken < max_entries do
+        local request_id = redis.call('LPOP', queue)
+        if not request_id then break end
+        local key = 'queue:req:' .. request_id
+        if redis.call('EXISTS', key) == 1 then
+            redis.call('HSET', key, 'status', 'processing', 'claimed_at', ARGV[2])
+            out[#out + 1] = request_id
+            out[#out + 1] = redis.call('HGETALL', key)
+            taken = taken + 1
+        end
+    end
+end
+return out
+"""
+
+# Re-queue a persisted request unless it is already waiting (status queued) or
+# was claimed by a tick less than ARGV[2] ms before ARGV[1]. KEYS: request
+# hash, tier list; ARGV[3]: request id, ARGV[4]: TTL, ARGV[5..]: hash fields.
+# Returns 1 if it was queued.
+RESTORE_LUA = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if status == 'queued' then return 0 end
+if status == 'processing' then
+    local claimed_at = tonumber(redis.call('HGET', KEYS[1], 'claimed_at') or '0')
+    if tonumber(ARGV[1]) - claimed_at < tonumber(ARGV[2]) then return 0 end
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], unpack(ARGV, 5))
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('RPUSH', KEYS[2], ARGV[3])
+return 1
+"""
+
+_scripts = {}
+
+
+def _get_script(source: str):
+    """Lazily register a script on the shared client (None if REDIS_URL is unset)"""
+    script = _scripts.get(source)
+    if script is None:
+        client = get_redis()
+        if client is not None:
+            script = _scripts[source] = client.register_script(source)
+    return script
+
+
+def _request_key(request_id: str) -> str:
+    return f"queue:req:{request_id}"
+
+
+def _decode(value) -> Optional[str]:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _warn(e: Exception):
+    log.warning("Redis queue unavailable, using in-memory queue: %s", e)
+
+
+def _queued_fields(entry) -> dict:
+    """Hash fields for a QueueEntry waiting in a shared queue"""
+    return {
+        'user_id': entry.user_id,
+        'event_id': entry.event_id,
+        'ticket_type_name': entry.ticket_type_name,
+        'created_at_ns': entry.created_at_ns,
+        'status': 'queued',
+    }
+
+
+async def redis_enqueue(entry) -> Optional[int]:
+    """
+    Append a QueueEntry to its tier's shared queue and return its 1-based position,
+    or None when Redis is not configured or unreachable (caller falls back).
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    request_id = entry.request_id
+    try:
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.hset(_request_key(request_id), mapping=_queued_fields(entry))
+            pipe.expire(_request_key(request_id), REQUEST_TTL_SECONDS)
+            pipe.rpush(QUEUE_KEYS[entry.ticket_type_name], request_id)
+            _, _, length = await pipe.execute()
+    except Exception as e:
+        _warn(e)
+        return None
+    return int(length)
+
+
+async def redis_requeue_front(entries: list) -> bool:
+    """
+    Put QueueEntry items back at the head of their tier's shared queue, in
+    their original order (after a failed tick). False without Redis or on error.
+    """
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        async with client.pipeline(transaction=True) as pipe:
+            for entry in reversed(entries):
+                pipe.hset(_request_key(entry.request_id), mapping=_queued_fields(entry))
+                pipe.expire(_request_key(entry.request_id), REQUEST_TTL_SECONDS)
+                pipe.lpush(QUEUE_KEYS[entry.ticket_type_name], entry.request_id)
+            await pipe.execute()
+    except Exception as e:
+        _warn(e)
+        return False
+    return True
+
+
+async def redis_restore(entries: list) -> Optional[int]:
+    """
+    Re-queue QueueEntry items for orders still 'queued' in the database, in
+    order, skipping any that are waiting in a shared queue or were claimed by a
+    live tick (see STALE_CLAIM_SECONDS). Atomic per entry, so workers starting
+    together never queue one twice. Returns how many were queued, or None when
+    Redis is not configured or unreachable.
+    """
+    script = _get_script(RESTORE_LUA)
+    if script is None:
+        return None
+    now_ms = int(time.time() * 1000)
+    restored = 0
+    try:
+        for entry in entries:
+            fields = [item for pair in _queued_fields(entry).items() for item in pair]
+            restored += await script(
+                keys=[_request_key(entry.request_id), QUEUE_KEYS[entry.ticket_type_name]],
+                args=[now_ms, STALE_CLAIM_SECONDS * 1000, entry.request_id, REQUEST_TTL_SECONDS, *fields],
+            )
+    except Exception as e:
+        _warn(e)
+        return None
+    return restored
+
+
+async def redis_dequeue_batch(max_entries: int) -> Optional[List[dict]]:
+    """
+    Pop up to max_entries requests (VIP first, then Regular) and mark them
+    processing in one round trip; each comes back as a dict of QueueEntry
+    fields. Ids whose entry expired are skipped.
+    Returns None when Redis is not configured or unreachable.
+    """
+    script = _get_script(DEQUEUE_BATCH_LUA)
+    if script is None:
+        return None
+    try:
+        result = await script(
+            keys=[QUEUE_KEYS["VIP"], QUEUE_KEYS["Regular"]],
+            args=[max_entries, int(time.time() * 1000)],
+        )
+    except Exception as e:
+        _warn(e)
+        return None
+
+    entries = []
+    for request_id, flat in zip(result[::2], result[1::2]):
+        fields = {_decode(k): _decode(v) for k, v in zip(flat[::2], flat[1::2])}
+        entries.append({
+            'request_id': _decode(request_id),
+            'user_id': int(fields['user_id']),
+            'event_id': int(fields['event_id']),
+            'ticket_type_name': fields['ticket_type_name'],
+            'created_at_ns': int(fields['created_at_ns']),
+        })
+    return entries
+
+
+async def redis_get_status(request_id: str) -> Optional[str]:
+    """Shared status for a request ('unknown' if absent), or None without Redis"""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        status = await client.hget(_request_key(request_id), 'status')
+    except Exception as e:
+        _warn(e)
+        return None
+    return _decode(status) or 'unknown'
+
+
+async def redis_get_position(request_id: str) -> Optional[tuple]:
+    """
+    (found, position, ticket_type_name) from the shared queue, or None without
+    Redis. found is False when the request is not waiting in a queue.
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        ticket_type_name = _decode(await client.hget(_request_key(request_id), 'ticket_type_name'))
+        if ticket_type_name not in QUEUE_KEYS:
+            return False, None, None
+        index = await client.lpos(QUEUE_KEYS[ticket_type_name], request_id)
+    except Exception as e:
+        _warn(e)
+        return None
+    if index is None:
+        return False, None, ticket_type_name
+    return True, index + 1, ticket_type_name
+
+
+async def redis_finish(request_ids: List[str]) -> bool:
+    """Drop finished requests' entries; False when Redis is not in use"""
+    client = get_redis()
+    if client is None:
+        return False
+    if request_ids:
+        try:
+            await client.delete(*(_request_key(rid) for rid in request_ids))
+        except Exception as e:
+            _warn(e)
+            return False
+    return True
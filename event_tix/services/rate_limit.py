@@ -1,33 +1,43 @@
-from typing import Dict, Tuple
-from datetime import datetime, timedelta
+import time
+from typing import Tuple
+from event_tix.services.rate_limit_redis import check_token_bucket
+from event_tix.services.rate_limit_store import RateLimitStore
 
-# In-memory rate limit tracker: user_id -> last_request_time
-_rate_limit_tracker: Dict[int, datetime] = {}
 RATE_LIMIT_SECONDS = 2
+# In-memory rate limit tracker: user_id -> last request (time.monotonic())
+_rate_limit_tracker = RateLimitStore(stale_after=RATE_LIMIT_SECONDS)
 
 
-def check_rate_limit(user_id: int) -> Tuple[bool, str]:
+async def check_rate_limit(user_id: int) -> Tuple[bool, str]:
     """
     Check if user is rate limited.
     Returns (is_allowed, message)
     """
-    now = datetime.utcnow()
+    # A one-token bucket refilled over RATE_LIMIT_SECONDS is exactly the
+    # last-request check below, shared across workers
+    shared = await check_token_bucket(f"user:{user_id}:ticket-requests", 1, RATE_LIMIT_SECONDS)
+    if shared is not None:
+        is_allowed, remaining = shared
+        if not is_allowed:
+            return False, f"Rate limit exceeded. Please wait {remaining:.1f} seconds."
+        return True, ""
+
+    now = time.monotonic()
     
-    if user_id in _rate_limit_tracker:
-        last_request = _rate_limit_tracker[user_id]
-        time_since_last = (now - last_request).total_seconds()
+    last_request = _rate_limit_tracker.get(user_id)
+    if last_request is not None:
+        time_since_last = now - last_request
         
         if time_since_last < RATE_LIMIT_SECONDS:
             remaining = RATE_LIMIT_SECONDS - time_since_last
             return False, f"Rate limit exceeded. Please wait {remaining:.1f} seconds."
     
     # Update last request time
-    _rate_limit_tracker[user_id] = now
+    _rate_limit_tracker.set(user_id, now, now)
     return True, ""
 
 
 def clear_rate_limit(user_id: int):
     """Clear rate limit for a user (for testing)"""
-    if user_id in _rate_limit_tracker:
-        del _rate_limit_tracker[user_id]
+    _rate_limit_tracker.pop(user_id)
 
@@ -1,48 +1,41 @@
-from typing import Dict, Tuple
-from datetime import datetime, timedelta
-from collections import deque
+import time
+from typing import Tuple
+from event_tix.services.rate_limit_redis import check_token_bucket
+from event_tix.services.rate_limit_store import RateLimitStore
 
-# Token bucket per user_id: user_id -> deque of request timestamps
-_checkout_buckets: Dict[int, deque] = {}
+# Token bucket per user: user_id -> (tokens, last_refill as time.monotonic()).
+# Holds up to CHECKOUT_MAX_REQUESTS tokens, refilled evenly over the window.
 CHECKOUT_MAX_REQUESTS = 5
 CHECKOUT_WINDOW_SECONDS = 60
+_checkout_buckets = RateLimitStore(stale_after=CHECKOUT_WINDOW_SECONDS)
+_CHECKOUT_REFILL_PER_SECOND = CHECKOUT_MAX_REQUESTS / CHECKOUT_WINDOW_SECONDS
 
 
-def check_checkout_rate_limit(user_id: int) -> Tuple[bool, str]:
+async def check_checkout_rate_limit(user_id: int) -> Tuple[bool, str]:
     """
     Check if user can make a checkout request using token bucket.
     Returns (is_allowed, message)
     """
-    now = datetime.utcnow()
-    window_start = now - timedelta(seconds=CHECKOUT_WINDOW_SECONDS)
+    shared = await check_token_bucket(f"user:{user_id}:checkout", CHECKOUT_MAX_REQUESTS, CHECKOUT_WINDOW_SECONDS)
+    if shared is not None:
+        is_allowed, wait_seconds = shared
+        if not is_allowed:
+            return False, f"Rate limit exceeded. Maximum {CHECKOUT_MAX_REQUESTS} requests per minute. Please wait {wait_seconds:.0f} seconds."
+        return True, ""
+
+    now = time.monotonic()
+    tokens, last_refill = _checkout_buckets.get(user_id, (CHECKOUT_MAX_REQUESTS, now))
+    tokens = min(CHECKOUT_MAX_REQUESTS, tokens + (now - last_refill) * _CHECKOUT_REFILL_PER_SECOND)
     
-    # Get or create bucket for user
-    if user_id not in _checkout_buckets:
-        _checkout_buckets[user_id] = deque()
-    
-    bucket = _checkout_buckets[user_id]
-    
-    # Remove timestamps outside the window
-    while bucket and bucket[0] < window_start:
-        bucket.popleft()
-    
-    # Check if bucket is full
-    if len(bucket) >= CHECKOUT_MAX_REQUESTS:
-        oldest_request = bucket[0]
-        wait_until = oldest_request + timedelta(seconds=CHECKOUT_WINDOW_SECONDS)
-        wait_seconds = (wait_until - now).total_seconds()
+    if tokens < 1.0:
+        _checkout_buckets.set(user_id, (tokens, now), now)
+        wait_seconds = (1.0 - tokens) / _CHECKOUT_REFILL_PER_SECOND
         return False, f"Rate limit exceeded. Maximum {CHECKOUT_MAX_REQUESTS} requests per minute. Please wait {wait_seconds:.0f} seconds."
     
-    # Add current request timestamp
-    bucket.append(now)
+    _checkout_buckets.set(user_id, (tokens - 1.0, now), now)
     return True, ""
 
 
 def clear_checkout_rate_limit(user_id: int):
     """Clear rate limit for a user (for testing)"""
-    if user_id in _checkout_buckets:
-        _checkout_buckets[user_id].clear()
-
-
-
-
+    _checkout_buckets.pop(user_id)
@@ -0,0 +1,70 @@
+import logging
+import time
+from typing import Optional, Tuple
+
+from event_tix.services.redis_client import get_redis
+
+log = logging.getLogger(__name__)
+
+# Token bucket as one atomic round trip, the same algorithm as the in-memory
+# limiters: refill by elapsed time (capacity per window), then spend a token if
+# one is there. State is a hash {tokens, ts}. Returns {allowed, wait_ms}.
+TOKEN_BUCKET_LUA = """
+local key = KEYS[1]
+local now_ms = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local window_ms = tonumber(ARGV[3])
+local refill_per_ms = capacity / window_ms
+
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local last_refill = tonumber(state[2]) or now_ms
+tokens = math.min(capacity, tokens + math.max(now_ms - last_refill, 0) * refill_per_ms)
+
+local allowed = 0
+local wait_ms = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait_ms = math.ceil((1 - tokens) / refill_per_ms)
+end
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now_ms)
+-- An idle bucket is full again after one window, so it can simply expire
+redis.call('PEXPIRE', key, window_ms)
+return {allowed, wait_ms}
+"""
+
+_script = None
+
+
+def _get_script():
+    """Lazily register the script on the shared client (None if REDIS_URL is unset)"""
+    global _script
+    if _script is None:
+        client = get_redis()
+        if client is not None:
+            _script = client.register_script(TOKEN_BUCKET_LUA)
+    return _script
+
+
+async def check_token_bucket(key: str, capacity: int, window_seconds: float) -> Optional[Tuple[bool, float]]:
+    """
+    Spend a token from a bucket shared across all workers: holds up to
+    `capacity` tokens, refilled evenly over `window_seconds`.
+    Returns (is_allowed, wait_seconds), or None when Redis is not configured
+    or unreachable so the caller can fall back to its in-memory bucket.
+    """
+    script = _get_script()
+    if script is None:
+        return None
+
+    try:
+        allowed, wait_ms = await script(
+            keys=[f"ratelimit:bucket:{key}"],
+            args=[int(time.time() * 1000), capacity, int(window_seconds * 1000)],
+        )
+    except Exception as e:
+        log.warning("Redis rate limit unavailable, using in-memory limiter: %s", e)
+        return None
+    return bool(allowed), max(int(wait_ms), 0) / 1000
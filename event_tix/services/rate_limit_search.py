@@ -1,48 +1,41 @@
-from typing import Dict, Tuple
-from datetime import datetime, timedelta
-from collections import deque
+import time
+from typing import Tuple
+from event_tix.services.rate_limit_redis import check_token_bucket
+from event_tix.services.rate_limit_store import RateLimitStore
 
-# Token bucket per IP: ip -> deque of request timestamps
-_search_buckets: Dict[str, deque] = {}
+# Token bucket per IP: ip -> (tokens, last_refill as time.monotonic()).
+# Holds up to SEARCH_MAX_REQUESTS tokens, refilled evenly over the window.
 SEARCH_MAX_REQUESTS = 10
 SEARCH_WINDOW_SECONDS = 60
+_search_buckets = RateLimitStore(stale_after=SEARCH_WINDOW_SECONDS)
+_SEARCH_REFILL_PER_SECOND = SEARCH_MAX_REQUESTS / SEARCH_WINDOW_SECONDS
 
 
-def check_search_rate_limit(ip: str) -> Tuple[bool, str]:
+async def check_search_rate_limit(ip: str) -> Tuple[bool, str]:
     """
     Check if IP can make a search request using token bucket.
     Returns (is_allowed, message)
     """
-    now = datetime.utcnow()
-    window_start = now - timedelta(seconds=SEARCH_WINDOW_SECONDS)
+    shared = await check_token_bucket(f"ip:{ip}:search", SEARCH_MAX_REQUESTS, SEARCH_WINDOW_SECONDS)
+    if shared is not None:
+        is_allowed, wait_seconds = shared
+        if not is_allowed:
+            return False, f"Rate limit exceeded. Maximum {SEARCH_MAX_REQUESTS} requests per minute. Please wait {wait_seconds:.0f} seconds."
+        return True, ""
+
+    now = time.monotonic()
+    tokens, last_refill = _search_buckets.get(ip, (SEARCH_MAX_REQUESTS, now))
+    tokens = min(SEARCH_MAX_REQUESTS, tokens + (now - last_refill) * _SEARCH_REFILL_PER_SECOND)
     
-    # Get or create bucket for IP
-    if ip not in _search_buckets:
-        _search_buckets[ip] = deque()
-    
-    bucket = _search_buckets[ip]
-    
-    # Remove timestamps outside the window
-    while bucket and bucket[0] < window_start:
-        bucket.popleft()
-    
-    # Check if bucket is full
-    if len(bucket) >= SEARCH_MAX_REQUESTS:
-        oldest_request = bucket[0]
-        wait_until = oldest_request + timedelta(seconds=SEARCH_WINDOW_SECONDS)
-        wait_seconds = (wait_until - now).total_seconds()
+    if tokens < 1.0:
+        _search_buckets.set(ip, (tokens, now), now)
+        wait_seconds = (1.0 - tokens) / _SEARCH_REFILL_PER_SECOND
         return False, f"Rate limit exceeded. Maximum {SEARCH_MAX_REQUESTS} requests per minute. Please wait {wait_seconds:.0f} seconds."
     
-    # Add current request timestamp
-    bucket.append(now)
+    _search_buckets.set(ip, (tokens - 1.0, now), now)
     return True, ""
 
 
 def clear_search_rate_limit(ip: str):
     """Clear rate limit for an IP (for testing)"""
-    if ip in _search_buckets:
-        _search_buckets[ip].clear()
-
-
-
-
+    _search_buckets.pop(ip)
@@ -0,0 +1,47 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+# Cap per limiter; beyond it the least recently written key is dropped
+RATE_LIMIT_MAX_KEYS = 100_000
+
+
+class RateLimitStore:
+    """
+    Bounded key -> state map for the in-memory rate limiters.
+    Keys are kept in write order, so entries idle for longer than
+    `stale_after` seconds (whose limit has fully reset) sit at the front and
+    are dropped as new writes arrive; the size never exceeds `max_keys`.
+    Only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, stale_after: float, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.stale_after = stale_after
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        return default if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        entries = self._entries
+        entries[key] = (now, value)
+        entries.move_to_end(key)
+        # Sweep from the oldest write; each key is dropped at most once
+        cutoff = now - self.stale_after
+        while entries:
+            written_at, _ = next(iter(entries.values()))
+            if written_at >= cutoff and len(entries) <= self.max_keys:
+                break
+            entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
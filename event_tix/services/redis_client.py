@@ -0,0 +1,20 @@
+import os
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # redis is optional; callers fall back to in-process state
+    redis_asyncio = None
+
+_client = None
+
+
+def get_redis():
+    """Return the shared async Redis client, or None when REDIS_URL is unset"""
+    global _client
+    if _client is not None:
+        return _client
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url or redis_asyncio is None:
+        return None
+    _client = redis_asyncio.from_url(redis_url)
+    return _client
@@ -0,0 +1,50 @@
+import hashlib
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+# In-memory cache of serialized public responses: key -> (expires_at, body, etag)
+_cache: Dict[str, Tuple[float, bytes, str]] = {}
+_epoch = 0
+CACHE_TTL_SECONDS = 30
+
+
+def cache_key(name: str) -> str:
+    """Build a cache key stamped with the current catalogue epoch"""
+    return f"{name}:v{_epoch}"
+
+
+def bump_epoch():
+    """Invalidate every cached event payload (call after event / ticket-type writes)"""
+    global _epoch
+    _epoch += 1
+    _cache.clear()
+
+
+def get_cached(key: str) -> Optional[Tuple[bytes, str]]:
+    """Return (body, etag) for a live entry, or None"""
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    expires_at, body, etag = entry
+    if expires_at < time.monotonic():
+        _cache.pop(key, None)
+        return None
+    return body, etag
+
+
+def set_cached(key: str, body: bytes) -> str:
+    """Store serialized bytes and return their ETag"""
+    # One-shot digest over the whole body so OpenSSL's SHA-256 (SHA-NI where available) does all the work
+    etag = '"' + hashlib.sha256(body).hexdigest() + '"'
+    _cache[key] = (time.monotonic() + CACHE_TTL_SECONDS, body, etag)
+    return etag
+
+
+def cached_response(request: Request, body: bytes, etag: str) -> Response:
+    """Return the cached bytes, or 304 when the client already has them"""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={CACHE_TTL_SECONDS}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
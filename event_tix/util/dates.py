@@ -1,18 +1,30 @@
 # event_tix/util/dates.py
 from datetime import datetime, timezone
+from functools import lru_cache
 
+# Pure helpers on hashable inputs; cached since the same event timestamps and
+# query boundaries recur across rows and requests.
+@lru_cache(maxsize=4096)
 def ensure_utc(dt: datetime | None) -> datetime | None:
-    if dt is None:
-        return None
+    if dt is None or dt.tzinfo is timezone.utc:
+        return dt
     if dt.tzinfo is None:
         # treat incoming naive as UTC (assuming client already sent UTC)
         return dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
 
+@lru_cache(maxsize=4096)
 def to_utc_iso(dt: datetime | None) -> str | None:
     """Convert datetime to UTC ISO string with Z suffix"""
     if dt is None:
         return None
-    utc_dt = ensure_utc(dt)
-    return utc_dt.isoformat().replace("+00:00", "Z")
+    # Same text as isoformat() (microseconds only when non-zero), minus the offset
+    return ensure_utc(dt).replace(tzinfo=None).isoformat() + "Z"
 
+@lru_cache(maxsize=1024)
+def parse_query_date(value: str, end_of_day: bool = False) -> datetime:
+    """Parse a YYYY-MM-DD or ISO datetime query value (raises ValueError).
+    Date-only values map to the start of the day, or its last second with end_of_day."""
+    if 'T' in value:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return datetime.fromisoformat(f"{value}T23:59:59" if end_of_day else f"{value}T00:00:00")